@@ -1,30 +1,198 @@
 # Copyright (C) 2022 Sergey Kovalevich <inndie@gmail.com>
 # This file may be distributed under the terms of the GNU GPLv3 license
 
+import cProfile
 import importlib
+import inspect
+import json
+import os
 import traceback
 import sys
 from argparse import ArgumentParser, SUPPRESS
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from app.parser import Parser
+from app.schema import Schema
+from app.generator import GeneratorBase
+from app.cache import SchemaCache
+from app.timings import Timings
+
+def parse_flag(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+''' Options which could be set per job (batch mode) and conversion of their values '''
+JOB_OPTIONS = {
+    'schema': str,
+    'destination': str,
+    'generator': str,
+    'package': str,
+    'streaming': parse_flag,
+    'jobs': int,
+    'cpp_bounds_check': str,
+    'python_record': str
+}
+
+def make_job(options: Dict[str, Any], defaults: Dict[str, Any], base_path: Optional[str] = None) -> Dict[str, Any]:
+    '''
+    Return job made of options (option name -> value), missing options are taken from defaults (command line).
+    Relative schema and destination paths are resolved against base_path
+    '''
+    job = dict(defaults)
+    for name, value in options.items():
+        name = name.replace('-', '_')
+        if name not in JOB_OPTIONS:
+            raise Exception(f'unknown job option "{name}"')
+        job[name] = JOB_OPTIONS[name](value)
+        if base_path and name in ('schema', 'destination'):
+            job[name] = os.path.join(base_path, job[name])
+    for name in ('schema', 'destination'):
+        if not job[name]:
+            raise Exception(f'job option "{name}" is not set')
+    return job
+
+def parse_job(value: str, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    ''' Return job described by "name=value,name=value,..." string (--job option) '''
+    options = {}
+    for item in value.split(','):
+        name, separator, option_value = item.partition('=')
+        if not separator:
+            raise Exception(f'invalid job option "{item}" (expected name=value)')
+        options[name.strip()] = option_value.strip()
+    return make_job(options, defaults)
+
+def load_jobs(path: str, defaults: Dict[str, Any]) -> List[Dict[str, Any]]:
+    '''
+    Return jobs of manifest: JSON list of objects with job options (or object with such list as "jobs").
+    Relative paths are resolved against directory of manifest
+    '''
+    with open(path, mode='r', encoding='utf8') as f:
+        manifest = json.load(f)
+    entries = manifest.get('jobs', []) if isinstance(manifest, dict) else manifest
+    base_path = os.path.dirname(os.path.abspath(path))
+    return [ make_job(entry, defaults, base_path) for entry in entries ]
+
+def load_schema_definition(job: Dict[str, Any], schemas: Dict[str, Schema], cache: Optional[SchemaCache], timings: Timings) -> dict:
+    ''' Return definition of job schema, parsed schemas (path -> schema) are shared by jobs with different packages '''
+    ir = None
+    if cache:
+        with timings.phase('cache load'):
+            ir = cache.load(job['schema'], package=job['package'])
+    if ir is None:
+        schema_path = os.path.abspath(job['schema'])
+        if schema_path not in schemas:
+            with timings.phase('load_xml'):
+                schema_parser = Parser.from_file(job['schema'], streaming=job['streaming'])
+            with timings.phase('get_schema'):
+                schemas[schema_path] = schema_parser.get_schema()
+        with timings.phase('ir'):
+            ir = GeneratorBase.make_schema_definition(schemas[schema_path], package=job['package'])
+        if cache:
+            with timings.phase('cache store'):
+                cache.store(job['schema'], ir, package=job['package'])
+    return ir
+
+def make_generator(job: Dict[str, Any]) -> GeneratorBase:
+    module = importlib.import_module(f'app.generation.{job["generator"]}')
+    Generator = getattr(module, 'Generator')
+    options = {}
+    if job['jobs']:
+        options['jobs'] = job['jobs']
+    if job['cpp_bounds_check']:
+        options['bounds_check'] = job['cpp_bounds_check']
+    if job['python_record']:
+        options['record'] = job['python_record']
+    # options are common for all jobs of batch, every generator takes the ones it supports
+    parameters = inspect.signature(Generator).parameters
+    return Generator(job['destination'], **{ name: value for name, value in options.items() if name in parameters })
+
+def init_batch_worker(bytecode_cache_dir: Optional[str]) -> None:
+    GeneratorBase.BYTECODE_CACHE_DIR = bytecode_cache_dir
+
+def run_batch_job(job: Dict[str, Any], ir: dict) -> List[Tuple[str, float, float]]:
+    ''' Run job in worker process and return render and write time of its documents (merged by parent) '''
+    timings = Timings()
+    GeneratorBase.TIMINGS = timings
+    make_generator(job).generate_from_definition(ir)
+    return timings.documents
 
 def main() -> None:
     parser = ArgumentParser(prog='sbe-code-gen', description='SBE codec generator')
-    parser.add_argument('--schema', help='path to xml schema', required=True)
-    parser.add_argument('--destination', help='path to directory where codec will be written', required=True)
+    parser.add_argument('--schema', help='path to xml schema')
+    parser.add_argument('--destination', help='path to directory where codec will be written')
     parser.add_argument('--generator', help='choose generator (available: cpp)', default='cpp')
     parser.add_argument('--package', help='override schema package property')
+    parser.add_argument('--streaming', help='load schema incrementally (lower memory usage for large schemas)', action='store_true')
+    parser.add_argument('--cache-dir', help='path to directory for caching parsed schemas and compiled templates between runs')
+    parser.add_argument('--jobs', help='number of processes used for rendering documents (cpp generator)', type=int)
+    parser.add_argument('--cpp-bounds-check', help='bounds check of buffer accesses in generated code (cpp and cpp-min generators)', choices=['throw', 'assert', 'none'])
+    parser.add_argument('--python-record', help='type of decoded messages and composites (python generator)', choices=['dict', 'tuple', 'namedtuple', 'slots'])
+    parser.add_argument('--manifest', help='path to JSON list of jobs (objects with options above) to run in one process', action='append', default=[])
+    parser.add_argument('--job', help='job to run in one process with others, "schema=...,destination=...[,generator=...,package=...]"', action='append', default=[])
+    parser.add_argument('--batch-workers', help='number of processes running jobs of batch', type=int, default=1)
+    parser.add_argument('--timings', help='print wall time and peak memory of each phase and N (default 10) slowest documents', nargs='?', type=int, const=10, metavar='N')
+    parser.add_argument('--profile', help='write cProfile statistics of the whole run to file', metavar='PATH')
 
     args = parser.parse_args()
+    if not args.manifest and not args.job and (not args.schema or not args.destination):
+        parser.error('the following arguments are required: --schema, --destination (or --manifest, --job)')
+
+    timings = Timings()
+    GeneratorBase.TIMINGS = timings
+    profile = cProfile.Profile() if args.profile else None
+    if profile:
+        profile.enable()
 
     try:
-        module = importlib.import_module(f'app.generation.{args.generator}')
-        Generator = getattr(module, 'Generator')
-        schema = Parser.from_file(args.schema).get_schema()
-        generator = Generator(args.destination)
-        generator.generate(schema, package=args.package)
+        defaults = { name: getattr(args, name) for name in JOB_OPTIONS }
+        jobs = []
+        for manifest in args.manifest:
+            jobs.extend(load_jobs(manifest, defaults))
+        jobs.extend(parse_job(value, defaults) for value in args.job)
+        if not args.manifest and not args.job:
+            jobs.append(make_job({}, defaults))
+
+        if args.cache_dir:
+            GeneratorBase.BYTECODE_CACHE_DIR = f'{args.cache_dir}/templates'
+        cache = SchemaCache(args.cache_dir) if args.cache_dir else None
+
+        # schema is parsed once for all jobs using it, definition is made once per schema and package
+        schemas = {}
+        definitions = {}
+        irs = []
+        for job in jobs:
+            definition_key = (os.path.abspath(job['schema']), job['package'] or None)
+            if definition_key not in definitions:
+                job_name = job['schema'] + (f' ({job["package"]})' if job['package'] else '')
+                with timings.job(job_name if len(jobs) > 1 else None):
+                    definitions[definition_key] = load_schema_definition(job, schemas, cache, timings)
+            irs.append(definitions[definition_key])
+
+        if args.batch_workers > 1 and len(jobs) > 1:
+            with timings.phase('generate'):
+                with ProcessPoolExecutor(max_workers=args.batch_workers, initializer=init_batch_worker, initargs=(GeneratorBase.BYTECODE_CACHE_DIR,)) as executor:
+                    futures = [ executor.submit(run_batch_job, job, ir) for job, ir in zip(jobs, irs) ]
+                    for job, future in zip(jobs, futures):
+                        with timings.job(f'{job["generator"]} {job["destination"]}'):
+                            for document in future.result():
+                                timings.add_document(*document)
+        else:
+            for job, ir in zip(jobs, irs):
+                with timings.job(f'{job["generator"]} {job["destination"]}' if len(jobs) > 1 else None):
+                    generator = make_generator(job)
+                    with timings.phase('generate'):
+                        generator.generate_from_definition(ir)
     except Exception as e:
         sys.exit(traceback.format_exc())
         sys.exit(f'error: {e}')
+    finally:
+        if profile:
+            profile.disable()
+            profile.dump_stats(args.profile)
+
+    if args.timings is not None:
+        print(timings.report(args.timings), file=sys.stderr)
 
 if __name__ == '__main__':
     main()
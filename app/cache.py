@@ -0,0 +1,91 @@
+# Copyright (C) 2022 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import xml.etree.ElementTree as ET
+import xml.etree.ElementInclude as EI
+from urllib.parse import urljoin
+from typing import Optional, List
+
+''' Sources which affect schema definition (IR) built from xml '''
+SOURCE_FILES = [ 'xml.py', 'parser.py', 'schema.py', 'generator.py' ]
+
+def file_digest(path: str) -> str:
+    with open(path, mode='rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def find_included_files(path: str) -> List[str]:
+    ''' Return paths of all files included (recursively) by xml document via <xi:include> '''
+    included = []
+    for _, el in ET.iterparse(path, events=('start',)):
+        if el.tag == EI.XINCLUDE_INCLUDE:
+            href = urljoin(path, el.attrib['href'])
+            if href not in included:
+                included.append(href)
+                if el.attrib.get('parse', 'xml') == 'xml':
+                    included.extend(f for f in find_included_files(href) if f not in included)
+    return included
+
+class SchemaCache:
+    '''
+    On-disk cache of schema definitions (IR dict built by GeneratorBase).
+
+    Entry is keyed by schema file content, package override and sources of the tool. Included files
+    are recorded inside the entry and validated on load.
+    '''
+
+    VERSION = None
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @staticmethod
+    def get_version() -> str:
+        if SchemaCache.VERSION is None:
+            digest = hashlib.sha256()
+            root = pathlib.Path(__file__).parent.resolve()
+            for source in SOURCE_FILES:
+                digest.update(file_digest(f'{root}/{source}').encode())
+            SchemaCache.VERSION = digest.hexdigest()
+        return SchemaCache.VERSION
+
+    def make_entry_path(self, schema_path: str, package: Optional[str]) -> str:
+        digest = hashlib.sha256()
+        digest.update(SchemaCache.get_version().encode())
+        digest.update(file_digest(schema_path).encode())
+        digest.update(repr(package).encode())
+        return f'{self.path}/{digest.hexdigest()}.json'
+
+    def load(self, schema_path: str, package: Optional[str] = None) -> Optional[dict]:
+        entry_path = self.make_entry_path(schema_path, package)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, mode='r', encoding='utf8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        for included_path, included_digest in entry['includes'].items():
+            if not os.path.exists(included_path) or file_digest(included_path) != included_digest:
+                return None
+        return entry['schema']
+
+    def store(self, schema_path: str, schema: dict, package: Optional[str] = None) -> None:
+        includes = { path: file_digest(path) for path in find_included_files(schema_path) }
+        entry_path = self.make_entry_path(schema_path, package)
+        if not os.path.exists(self.path):
+            os.makedirs(self.path, exist_ok=True)
+        # write into temporary file first, cache directory could be shared by concurrent runs
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode='w', encoding='utf8') as f:
+                json.dump({ 'includes': includes, 'schema': schema }, f)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -1,34 +1,40 @@
 # Copyright (C) 2022 Sergey Kovalevich <inndie@gmail.com>
 # This file may be distributed under the terms of the GNU GPLv3 license
 
-from jinja2 import Environment, FileSystemLoader
+from typing import Tuple
 import pathlib
+import time
 import os
 
 from app.generator import GeneratorBase
 
 class Generator(GeneratorBase):
-    def __init__(self, path: str) -> None:
+    BOUNDS_CHECKS = ('throw', 'assert', 'none')
+
+    def __init__(self, path: str, bounds_check: str = 'throw') -> None:
+        if bounds_check not in Generator.BOUNDS_CHECKS:
+            raise Exception(f'unknown bounds check policy "{bounds_check}"')
         self.path = path
-        self.env = Environment(
-            loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
-            autoescape = False,
-            trim_blocks = True,
-            lstrip_blocks = True,
-            keep_trailing_newline = True
-        )
+        self.bounds_check = bounds_check
+        self.env = GeneratorBase.get_environment(f'{pathlib.Path(__file__).parent.resolve()}/templates', bounds_check=bounds_check)
         self.add_filters()
 
     def _generate_impl(self, schema: dict) -> None:
         self.ensure_path_exists()
-        self.generate_document('schema.h', 'schema.tmpl', schema=schema)
+        fingerprint = self.make_fingerprint(schema, self.bounds_check)
+        if not self.is_document_up_to_date(self.load_manifest(), 'schema.h', fingerprint):
+            GeneratorBase.record_document_timings('schema.h', *self.generate_document('schema.h', 'schema.tmpl', schema=schema))
+        self.update_manifest({ 'schema.h': fingerprint })
 
-    def generate_document(self, document_name: str, template_name: str, **kwargs) -> None:
+    def generate_document(self, document_name: str, template_name: str, **kwargs) -> Tuple[float, float]:
+        ''' Render and write document, return time spent on rendering (template loading included) and writing '''
+        start = time.perf_counter()
         template = self.env.get_template(template_name)
         document_path = f'{self.path}/{document_name}'
         document_content = template.render(**kwargs)
-        with open(document_path, mode='w', encoding='utf8') as document:
-            document.write(document_content)
+        rendered = time.perf_counter()
+        GeneratorBase.write_document_content(document_path, document_content)
+        return rendered - start, time.perf_counter() - rendered
 
     def ensure_path_exists(self) -> None:
         if not os.path.exists(self.path):
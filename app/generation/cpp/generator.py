@@ -1,56 +1,133 @@
 # Copyright (C) 2022 Sergey Kovalevich <inndie@gmail.com>
 # This file may be distributed under the terms of the GNU GPLv3 license
 
-from jinja2 import Environment, FileSystemLoader
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
 import pathlib
+import time
 import os
 
 from app.generator import GeneratorBase
 
+# per worker process state for parallel rendering (see Generator.init_worker)
+worker_generator = None
+worker_schema = None
+
 class Generator(GeneratorBase):
-    def __init__(self, path: str) -> None:
+    BOUNDS_CHECKS = ('throw', 'assert', 'none')
+
+    def __init__(self, path: str, jobs: int = 1, bounds_check: str = 'throw') -> None:
+        if bounds_check not in Generator.BOUNDS_CHECKS:
+            raise Exception(f'unknown bounds check policy "{bounds_check}"')
         self.path = path
-        self.env = Environment(
-            loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
-            autoescape = False,
-            trim_blocks = True,
-            lstrip_blocks = True,
-            keep_trailing_newline = True
-        )
+        self.jobs = jobs
+        self.bounds_check = bounds_check
+        self.env = GeneratorBase.get_environment(f'{pathlib.Path(__file__).parent.resolve()}/templates', bounds_check=bounds_check)
         self.add_filters()
 
     def _generate_impl(self, schema: dict) -> None:
         self.ensure_path_exists()
 
-        for encoded_type in schema['types']:
+        documents = self.make_documents(schema)
+        fingerprints = self.make_document_fingerprints(schema, documents)
+
+        # render only documents whose part of schema definition changed since previous run
+        manifest = self.load_manifest()
+        documents_to_render = [document for document in documents if not self.is_document_up_to_date(manifest, document[0], fingerprints[document[0]])]
+        if len(documents_to_render) != len(documents):
+            print(f'Skipping {len(documents) - len(documents_to_render)} unchanged documents')
+        documents = documents_to_render
+
+        if self.jobs > 1 and len(documents) > 1:
+            # each worker receives schema once on startup and renders documents by index
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=Generator.init_worker, initargs=(self.path, self.bounds_check, schema)) as executor:
+                chunksize = len(documents) // (self.jobs * 4) + 1
+                for document, timings in zip(documents, executor.map(Generator.generate_worker_document, documents, chunksize=chunksize)):
+                    GeneratorBase.record_document_timings(document[0], *timings)
+        else:
+            for document in documents:
+                GeneratorBase.record_document_timings(document[0], *self.generate_schema_document(schema, *document))
+
+        self.update_manifest(fingerprints)
+
+    def make_documents(self, schema: dict) -> list:
+        ''' Return list of (document name, template name, IR section, index inside section) to generate '''
+        documents = []
+
+        for index, encoded_type in enumerate(schema['types']):
             type_class_name = self.env.filters['fmt_class_type'](encoded_type['name'])
             type_class_h_file = self.env.filters['fmt_header_name'](type_class_name)
             if encoded_type['token'] == 'type':
                 pass
             elif encoded_type['token'] == 'composite':
-                print(f'Cenerating composite type {type_class_name} (to {type_class_h_file})')
-                self.generate_document(type_class_h_file, 'composite.tmpl', type=encoded_type, schema=schema)
+                documents.append((type_class_h_file, 'composite.tmpl', 'types', index))
             elif encoded_type['token'] == 'enum':
-                print(f'Cenerating enum type {type_class_name} (to {type_class_h_file})')
-                self.generate_document(type_class_h_file, 'enum.tmpl', type=encoded_type, schema=schema)
+                documents.append((type_class_h_file, 'enum.tmpl', 'types', index))
             elif encoded_type['token'] == 'set':
-                print(f'Cenerating set type {type_class_name} (to {type_class_h_file})')
-                self.generate_document(type_class_h_file, 'set.tmpl', type=encoded_type, schema=schema)
+                documents.append((type_class_h_file, 'set.tmpl', 'types', index))
 
-        for message in schema['messages']:
+        for index, message in enumerate(schema['messages']):
             message_class_name = self.env.filters['fmt_class_message'](message['name'])
             message_class_h_file = self.env.filters['fmt_header_name'](message_class_name)
-            print(f'Generating message {message_class_name} (to {message_class_h_file})')
-            self.generate_document(message_class_h_file, 'message.tmpl', message=message, schema=schema)
+            documents.append((message_class_h_file, 'message.tmpl', 'messages', index))
 
-        self.generate_document('schema.h', 'schema.tmpl', schema=schema)
+        documents.append(('schema.h', 'schema.tmpl', None, None))
+        return documents
+
+    def make_document_fingerprints(self, schema: dict, documents: list) -> dict:
+        '''
+        Return fingerprint by document name. Fingerprint covers exactly the part of schema definition the
+        template reads: message and type documents depend on its own definition (used types are inlined)
+        and schema attributes (and generation options), header type and schema.h also list names, ids and
+        versions of all messages
+        '''
+        schema_attributes = { key: schema[key] for key in ('package', 'id', 'version', 'byte_order', 'description', 'header_type') }
+        schema_attributes['bounds_check'] = self.bounds_check
+        message_ids = [ (message['name'], message['id'], message['since_version']) for message in schema['messages'] ]
+        fingerprints = {}
+        for document_name, template_name, section, index in documents:
+            if section == 'types':
+                encoded_type = schema['types'][index]
+                if encoded_type['name'] == schema['header_type']['name']:
+                    fingerprints[document_name] = self.make_fingerprint(template_name, schema_attributes, encoded_type, message_ids)
+                else:
+                    fingerprints[document_name] = self.make_fingerprint(template_name, schema_attributes, encoded_type)
+            elif section == 'messages':
+                fingerprints[document_name] = self.make_fingerprint(template_name, schema_attributes, schema['messages'][index])
+            else:
+                fingerprints[document_name] = self.make_fingerprint(template_name, schema_attributes, message_ids)
+        return fingerprints
+
+    def generate_schema_document(self, schema: dict, document_name: str, template_name: str, section: str, index: int) -> Tuple[float, float]:
+        if section == 'types':
+            encoded_type = schema['types'][index]
+            print(f'Generating {encoded_type["token"]} type {self.env.filters["fmt_class_type"](encoded_type["name"])} (to {document_name})')
+            return self.generate_document(document_name, template_name, type=encoded_type, schema=schema)
+        elif section == 'messages':
+            print(f'Generating message {self.env.filters["fmt_class_message"](schema["messages"][index]["name"])} (to {document_name})')
+            return self.generate_document(document_name, template_name, message=schema['messages'][index], schema=schema)
+        else:
+            return self.generate_document(document_name, template_name, schema=schema)
+
+    @staticmethod
+    def init_worker(path: str, bounds_check: str, schema: dict) -> None:
+        global worker_generator, worker_schema
+        worker_generator = Generator(path, bounds_check=bounds_check)
+        worker_schema = schema
+
+    @staticmethod
+    def generate_worker_document(document: tuple) -> Tuple[float, float]:
+        return worker_generator.generate_schema_document(worker_schema, *document)
 
-    def generate_document(self, document_name: str, template_name: str, **kwargs) -> None:
+    def generate_document(self, document_name: str, template_name: str, **kwargs) -> Tuple[float, float]:
+        ''' Render and write document, return time spent on rendering (template loading included) and writing '''
+        start = time.perf_counter()
         template = self.env.get_template(template_name)
         document_path = f'{self.path}/{document_name}'
         document_content = template.render(**kwargs)
-        with open(document_path, mode='w', encoding='utf8') as document:
-            document.write(document_content)
+        rendered = time.perf_counter()
+        GeneratorBase.write_document_content(document_path, document_content)
+        return rendered - start, time.perf_counter() - rendered
 
     def ensure_path_exists(self) -> None:
         if not os.path.exists(self.path):
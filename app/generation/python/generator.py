@@ -1,37 +1,44 @@
 # Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
 # This file may be distributed under the terms of the GNU GPLv3 license
 
-from jinja2 import Environment, FileSystemLoader
-from typing import Optional
+from typing import Optional, Tuple
 import pathlib
+import keyword
+import math
 import os
 import re
+import time
 import numpy as np
 
 from app.generator import GeneratorBase
 
 class Generator(GeneratorBase):
-    def __init__(self, path: str) -> None:
+    RECORDS = ('dict', 'tuple', 'namedtuple', 'slots')
+
+    def __init__(self, path: str, record: str = 'dict') -> None:
+        if record not in Generator.RECORDS:
+            raise Exception(f'unknown python record type "{record}"')
         self.path = path
-        self.env = Environment(
-            loader = FileSystemLoader(f'{pathlib.Path(__file__).parent.resolve()}/templates'),
-            autoescape = False,
-            trim_blocks = True,
-            lstrip_blocks = True,
-            keep_trailing_newline = True
-        )
+        self.record = record
+        self.env = GeneratorBase.get_environment(f'{pathlib.Path(__file__).parent.resolve()}/templates')
         self.add_filters()
 
     def _generate_impl(self, schema: dict) -> None:
         self.ensure_path_exists()
-        self.generate_document('schema.py', 'schema.tmpl', schema=schema)
+        fingerprint = self.make_fingerprint(schema, self.record)
+        if not self.is_document_up_to_date(self.load_manifest(), 'schema.py', fingerprint):
+            GeneratorBase.record_document_timings('schema.py', *self.generate_document('schema.py', 'schema.tmpl', schema=schema, record=self.record))
+        self.update_manifest({ 'schema.py': fingerprint })
 
-    def generate_document(self, document_name: str, template_name: str, **kwargs) -> None:
+    def generate_document(self, document_name: str, template_name: str, **kwargs) -> Tuple[float, float]:
+        ''' Render and write document, return time spent on rendering (template loading included) and writing '''
+        start = time.perf_counter()
         template = self.env.get_template(template_name)
         document_path = f'{self.path}/{document_name}'
         document_content = template.render(**kwargs)
-        with open(document_path, mode='w', encoding='utf8') as document:
-            document.write(document_content)
+        rendered = time.perf_counter()
+        GeneratorBase.write_document_content(document_path, document_content)
+        return rendered - start, time.perf_counter() - rendered
 
     def ensure_path_exists(self) -> None:
         if not os.path.exists(self.path):
@@ -39,6 +46,11 @@ class Generator(GeneratorBase):
 
     def add_filters(self) -> None:
         self.env.filters['format_message_name'] = lambda value: value[0].upper() + value[1:] + 'Message'
+        self.env.filters['format_view_name'] = lambda value: value[0].upper() + value[1:] + 'View'
+        self.env.filters['format_property_name'] = lambda value: value + '_' if keyword.iskeyword(value) else value
+        self.env.filters['format_record_name'] = lambda value: '_'.join(part[0].upper() + part[1:] for part in value.split('_') if part) + 'Record'
+        self.env.filters['composite_types'] = Generator.filter_composite_types
+        self.env.filters['format_group_name'] = lambda value: value[0].upper() + value[1:]
         self.env.filters['format_composite_name'] = lambda value: value[0].upper() + value[1:]
         self.env.filters['format_enum_name'] = lambda value: value[0].upper() + value[1:]
         self.env.filters['format_set_name'] = lambda value: value[0].upper() + value[1:]
@@ -46,6 +58,143 @@ class Generator(GeneratorBase):
         self.env.filters['replace_keyword']  = Generator.filter_replace_keyword
         self.env.filters['bit_to_value'] = lambda value: 1 << int(value)
         self.env.filters['struct_fmt'] = Generator.filter_struct_fmt
+        self.env.filters['null_literal'] = Generator.filter_null_literal
+        self.env.filters['block_layout'] = Generator.filter_block_layout
+        self.env.filters['composite_layout'] = Generator.filter_composite_layout
+        self.env.filters['block_dtype'] = Generator.filter_block_dtype
+
+    @staticmethod
+    def filter_composite_types(schema: dict) -> list:
+        ''' Return composite types of schema including nested ones (nested go first), each name once '''
+        composites = {}
+
+        def add_composite(type: dict) -> None:
+            for contained in type['contained_types']:
+                if contained['token'] == 'composite':
+                    add_composite(contained)
+            composites.setdefault(type['name'], type)
+
+        for type in schema['types']:
+            if type['token'] == 'composite':
+                add_composite(type)
+        return list(composites.values())
+
+    @staticmethod
+    def filter_null_literal(type: dict) -> str:
+        ''' Return python literal of null value of type as it is packed/unpacked by struct module '''
+        if type['token'] == 'set':
+            return '0'
+        primitive_type = type['primitive_type'] if type['token'] == 'type' else type['encoding_type']
+        value = Generator.filter_replace_keyword(type['null_value'])
+        if primitive_type['name'] == 'char':
+            if isinstance(value, str) and not value.isdigit():
+                return repr(value.encode('ascii'))
+            return repr(bytes([int(value)]))
+        if primitive_type['name'] in ('float', 'double'):
+            value = float(value)
+            return 'float(\'nan\')' if math.isnan(value) else repr(value)
+        return str(int(value))
+
+    @staticmethod
+    def make_block_layout(members: list, byte_order: str, block_length: Optional[int] = None) -> dict:
+        '''
+        Return layout of fixed-size block: struct format covering all encoded members (constants take no
+        space) and position of each member value inside unpacked values tuple. Format is padded up to
+        block_length (if any), so packing fills whole block.
+        Members are (name, type, presence, offset, value_ref, since_version) tuples ordered by offset
+        '''
+        fmt = [ '<' if byte_order == 'littleEndian' else '>' ]
+        position = 0
+        index = 0
+
+        def add_member(name: str, type: dict, presence: str, offset: int, value_ref: Optional[str], since_version: int) -> dict:
+            nonlocal position, index
+            if type['token'] == 'type' and type['presence'] == 'constant':
+                presence = 'constant'
+            entry = {
+                'name': name, 'type': type, 'presence': presence, 'value_ref': value_ref, 'since_version': since_version,
+                'offset': offset, 'index': index, 'count': 0, 'size': 0
+            }
+            if presence == 'constant':
+                return entry
+            if type['token'] == 'composite':
+                entry['entries'] = [
+                    add_member(contained['reference_name'], contained, contained.get('presence', 'required'), offset + contained['offset'], None, 0)
+                        for contained in type['contained_types']
+                ]
+                entry['count'] = index - entry['index']
+                entry['size'] = type['encoded_length']
+                return entry
+            if offset > position:
+                fmt.append(f'{offset - position}x')
+                position = offset
+            if type['token'] == 'type':
+                primitive_type = type['primitive_type']
+                if primitive_type['name'] == 'char':
+                    code, count = ('c' if type['length'] == 1 else f'{type["length"]}s'), 1
+                else:
+                    code = Generator.filter_struct_fmt(primitive_type['name'])
+                    code, count = (code if type['length'] == 1 else f'{type["length"]}{code}'), type['length']
+                size = primitive_type['size'] * type['length']
+            else:
+                code = Generator.filter_struct_fmt(type['encoding_type']['name'])
+                count = 1
+                size = type['encoding_type']['size']
+            fmt.append(code)
+            entry.update(code=code, count=count, size=size)
+            position += size
+            index += count
+            return entry
+
+        entries = [ add_member(*member) for member in members ]
+        if block_length is not None and block_length > position:
+            fmt.append(f'{block_length - position}x')
+            position = block_length
+        return { 'format': ''.join(fmt), 'size': position, 'count': index, 'entries': entries }
+
+    @staticmethod
+    def filter_block_layout(fields: list, schema: dict, block_length: Optional[int] = None) -> dict:
+        members = [ (field['name'], field['type'], field['presence'], field['offset'], field['value_ref'], field['since_version']) for field in fields if field['token'] == 'field' ]
+        return Generator.make_block_layout(members, schema['byte_order'], block_length)
+
+    @staticmethod
+    def filter_composite_layout(type: dict, schema: dict) -> dict:
+        members = [ (contained['reference_name'], contained, contained.get('presence', 'required'), contained['offset'], None, 0) for contained in type['contained_types'] ]
+        return Generator.make_block_layout(members, schema['byte_order'])
+
+    @staticmethod
+    def make_dtype_spec(members: list, byte_order: str, itemsize: int) -> dict:
+        '''
+        Return numpy structured dtype specification (names, formats, offsets, itemsize) of fixed-size block.
+        Members are (name, type, presence, offset) tuples, constants take no space and are omitted
+        '''
+        flag = '<' if byte_order == 'littleEndian' else '>'
+        spec = { 'names': [], 'formats': [], 'offsets': [], 'itemsize': itemsize }
+        for name, type, presence, offset in members:
+            if presence == 'constant' or (type['token'] == 'type' and type['presence'] == 'constant'):
+                continue
+            if type['token'] == 'composite':
+                contained_members = [ (contained['reference_name'], contained, contained.get('presence', 'required'), contained['offset']) for contained in type['contained_types'] ]
+                fmt = Generator.make_dtype_spec(contained_members, byte_order, type['encoded_length'])
+            else:
+                primitive_type = type['primitive_type'] if type['token'] == 'type' else type['encoding_type']
+                length = type['length'] if type['token'] == 'type' else 1
+                if primitive_type['name'] == 'char':
+                    fmt = f'S{length}'
+                else:
+                    kind = 'f' if primitive_type['name'] in ('float', 'double') else ('u' if primitive_type['name'].startswith('uint') else 'i')
+                    fmt = f'{flag}{kind}{primitive_type["size"]}'
+                    if length > 1:
+                        fmt = f'({length},){fmt}'
+            spec['names'].append(name)
+            spec['formats'].append(fmt)
+            spec['offsets'].append(offset)
+        return spec
+
+    @staticmethod
+    def filter_block_dtype(fields: list, schema: dict, block_length: int) -> str:
+        members = [ (field['name'], field['type'], field['presence'], field['offset']) for field in fields if field['token'] == 'field' ]
+        return repr(Generator.make_dtype_spec(members, schema['byte_order'], block_length))
 
     @staticmethod
     def filter_struct_fmt(value: str) -> str:
@@ -3,17 +3,170 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import pathlib
+import sys
 from abc import ABC, abstractmethod
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader
 from dataclasses import dataclass, field, asdict
-from typing import Optional
+from typing import Optional, Dict, Any
 from app.schema import *
+from app.timings import Timings
 
 class GeneratorBase(ABC):
+    ''' File inside destination directory with the list of documents written by previous run of generator '''
+    MANIFEST_NAME = '.sbe-code-gen.{generator}.json'
+
+    ''' Directory for compiled templates shared by all generators (None for no caching between runs) '''
+    BYTECODE_CACHE_DIR: Optional[str] = None
+
+    ''' Compiled templates cache by directory '''
+    BYTECODE_CACHE_BY_DIR: Dict[str, Optional[BytecodeCache]] = {}
+
+    ''' Template environments by templates directory, compiled templates directory and globals '''
+    ENVIRONMENT_BY_KEY: Dict[tuple, Environment] = {}
+
+    ''' Digest of generator sources by generator module '''
+    TEMPLATES_DIGEST_BY_MODULE: Dict[str, str] = {}
+
+    ''' Collector of phase and document timings of the run (None for no collecting) '''
+    TIMINGS: Optional[Timings] = None
+
     @abstractmethod
     def _generate_impl(self, schema: dict) -> None:
         pass
 
     def generate(self, schema: Schema, package: Optional[str] = None) -> None:
+        self._generate_impl(GeneratorBase.make_schema_definition(schema, package))
+
+    def generate_from_definition(self, ir: dict) -> None:
+        self._generate_impl(ir)
+
+    @staticmethod
+    def get_bytecode_cache() -> Optional[BytecodeCache]:
+        '''
+        Return cache of compiled templates, so templates are compiled once and reused by next runs.
+        Return None in case cache directory is not set (cache is opt-in, see --cache-dir) or not usable
+        '''
+        directory = GeneratorBase.BYTECODE_CACHE_DIR
+        if directory is None:
+            return None
+        if directory not in GeneratorBase.BYTECODE_CACHE_BY_DIR:
+            bytecode_cache = None
+            try:
+                os.makedirs(directory, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(directory)
+            except (OSError, RuntimeError):
+                pass
+            GeneratorBase.BYTECODE_CACHE_BY_DIR[directory] = bytecode_cache
+        return GeneratorBase.BYTECODE_CACHE_BY_DIR[directory]
+
+    @staticmethod
+    def get_environment(templates_path: str, **globals: Any) -> Environment:
+        '''
+        Return template environment for templates directory. Environment is shared by all generators of
+        the process with the same templates and globals, so running many generators (batch mode) loads and
+        compiles every template once
+        '''
+        key = (templates_path, GeneratorBase.BYTECODE_CACHE_DIR, tuple(sorted(globals.items())))
+        if key not in GeneratorBase.ENVIRONMENT_BY_KEY:
+            env = Environment(
+                loader = FileSystemLoader(templates_path),
+                autoescape = False,
+                trim_blocks = True,
+                lstrip_blocks = True,
+                keep_trailing_newline = True,
+                bytecode_cache = GeneratorBase.get_bytecode_cache()
+            )
+            env.globals.update(globals)
+            GeneratorBase.ENVIRONMENT_BY_KEY[key] = env
+        return GeneratorBase.ENVIRONMENT_BY_KEY[key]
+
+    @staticmethod
+    def record_document_timings(document_name: str, render_seconds: float, write_seconds: float) -> None:
+        if GeneratorBase.TIMINGS is not None:
+            GeneratorBase.TIMINGS.add_document(document_name, render_seconds, write_seconds)
+
+    @staticmethod
+    def write_document_content(document_path: str, document_content: str) -> bool:
+        '''
+        Write document content unless file already has exactly the same content (unchanged files keep
+        their mtime). Return True on file written
+        '''
+        data = document_content.encode('utf8')
+        if os.path.isfile(document_path) and os.path.getsize(document_path) == len(data):
+            with open(document_path, mode='rb') as document:
+                if document.read() == data:
+                    return False
+        with open(document_path, mode='wb') as document:
+            document.write(data)
+        return True
+
+    def get_manifest_path(self) -> str:
+        '''
+        Return path of manifest of generator (name of generator package), every generator writing into the same
+        directory keeps its own list of documents
+        '''
+        generator = type(self).__module__.split('.')[-2]
+        return f'{self.path}/{GeneratorBase.MANIFEST_NAME.format(generator=generator)}'
+
+    def load_manifest(self) -> dict:
+        manifest_path = self.get_manifest_path()
+        if not os.path.isfile(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, mode='r', encoding='utf8') as manifest:
+                return json.load(manifest)
+        except ValueError:
+            return {}
+
+    def update_manifest(self, documents: Dict[str, str]) -> None:
+        '''
+        Remove documents written by previous run and not generated anymore, then save new documents
+        (document name -> fingerprint). Only documents listed by manifest are removed, so files not written
+        by the generator (or output without manifest) are never touched
+        '''
+        manifest = self.load_manifest()
+        for document_name in manifest.get('documents', {}):
+            document_path = f'{self.path}/{document_name}'
+            if document_name not in documents and os.path.isfile(document_path):
+                os.remove(document_path)
+        manifest['documents'] = documents
+        GeneratorBase.write_document_content(self.get_manifest_path(), json.dumps(manifest, indent=2))
+
+    def is_document_up_to_date(self, manifest: dict, document_name: str, fingerprint: str) -> bool:
+        ''' Return True on document was rendered by previous run from the same fingerprint and still exists '''
+        if manifest.get('documents', {}).get(document_name) != fingerprint:
+            return False
+        return os.path.isfile(f'{self.path}/{document_name}')
+
+    def get_templates_digest(self) -> str:
+        ''' Digest of generator sources: templates and module with template filters '''
+        module_name = type(self).__module__
+        if module_name not in GeneratorBase.TEMPLATES_DIGEST_BY_MODULE:
+            digest = hashlib.sha256()
+            paths = [ pathlib.Path(sys.modules[module_name].__file__) ]
+            for searchpath in self.env.loader.searchpath:
+                paths.extend(sorted(path for path in pathlib.Path(searchpath).rglob('*') if path.is_file()))
+            for path in paths:
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+            GeneratorBase.TEMPLATES_DIGEST_BY_MODULE[module_name] = digest.hexdigest()
+        return GeneratorBase.TEMPLATES_DIGEST_BY_MODULE[module_name]
+
+    def make_fingerprint(self, *parts: Any) -> str:
+        '''
+        Return fingerprint of document rendered from parts of schema definition. Any change in parts or in
+        generator sources changes fingerprint
+        '''
+        digest = hashlib.sha256(self.get_templates_digest().encode())
+        digest.update(json.dumps(parts, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_schema_definition(schema: Schema, package: Optional[str] = None) -> dict:
         ir = {}
         if not package:
             ir['package'] = schema.package.split('.') if schema.package else None
@@ -30,7 +183,7 @@ class GeneratorBase(ABC):
         ir['messages'] = []
         for message in schema.messages.values():
             ir['messages'].append(GeneratorBase.make_message_definition(message))
-        self._generate_impl(ir)
+        return ir
 
     @staticmethod
     def make_encoded_type_definition(encoded_type: EncodedType) -> dict:
@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 import xml.etree.ElementTree as ET
-from typing import Optional, Dict, Union, Tuple
+from typing import Optional, Dict, Union, Tuple, Iterator
 from collections import UserDict
 from app.schema import *
 from app.xml import *
@@ -37,11 +37,25 @@ class Parser:
     ''' Primitive type names suitable for encodingType of set '''
     VALID_PRIMITIVE_TYPE_FOR_SET = [ 'uint8', 'uint16', 'uint32', 'uint64' ]
 
-    def __init__(self, root: ET.Element) -> None:
+    def __init__(self, root: ET.Element, message_nodes: Optional[Iterator[ET.Element]] = None) -> None:
         self.root = root
+        # lazily loaded <message> nodes (streaming mode), otherwise messages are taken from root
+        self.message_nodes = message_nodes
+        # index of <types> children by name (first definition wins, same as ElementTree.find)
+        self.type_node_by_name = {}
+        for node in self.root.iterfind('.//types/*'):
+            name = node.get('name')
+            if name != None and name not in self.type_node_by_name:
+                self.type_node_by_name[name] = node
+        # encoded types parsed so far, each <types> child is parsed exactly once
+        self.encoded_type_by_name = {}
+        self.header_type = None
 
     @staticmethod
-    def from_file(path: str) -> Parser:
+    def from_file(path: str, streaming: bool = False) -> Parser:
+        if streaming:
+            root, message_nodes = stream_xml_from_file(path, 'message')
+            return Parser(root, message_nodes)
         root = load_xml_from_file(path)
         return Parser(root)
 
@@ -73,14 +87,17 @@ class Parser:
             types[encoded_type.name] = encoded_type
         # load types from xml
         for node in self.root.findall('./types/*'):
-            encoded_type = self.parse_encoded_type_from_node(node)
+            encoded_type = self.get_encoded_type_by_name(attr(node, 'name'))
             types[encoded_type.name] = encoded_type
         return types
 
     def get_messages(self) -> Dict[str, Message]:
         message_by_name = UniqueKeysDict()
         message_by_id = UniqueKeysDict()
-        for child in self.root.findall('./message'):
+        message_nodes = self.message_nodes if self.message_nodes != None else self.root.findall('./message')
+        # streamed nodes are freed while iterating and can't be read twice
+        self.message_nodes = None
+        for child in message_nodes:
             message = self.parse_message_from_node(child)
             message_by_name[message.name] = message
             message_by_id[message.id] = message
@@ -438,10 +455,10 @@ class Parser:
     def get_encoding_type_for_enum(self, encoding_type_str: str) -> PrimitiveType:
         if encoding_type_str in Parser.VALID_PRIMITIVE_TYPE_FOR_ENUM:
             return Parser.get_primitive_type(encoding_type_str)
-        encoding_type_node = self.root.find(f'.//types/type[@name="{encoding_type_str}"]')
-        if encoding_type_node == None:
+        encoding_type_node = self.type_node_by_name.get(encoding_type_str)
+        if encoding_type_node == None or encoding_type_node.tag != 'type':
             raise Exception(f'encodingType "{encoding_type_str}" for <enum> not found')
-        encoding_type = self.parse_type_from_node(encoding_type_node)
+        encoding_type = self.get_encoded_type_by_name(encoding_type_str)
         primitive_type = encoding_type.primitive_type
         if primitive_type.name not in Parser.VALID_PRIMITIVE_TYPE_FOR_ENUM:
             raise Exception(f'type "{encoding_type_str}" is not valid for <enum> encodingType')
@@ -450,10 +467,10 @@ class Parser:
     def get_encoding_type_for_set(self, encoding_type_str: str) -> PrimitiveType:
         if encoding_type_str in Parser.VALID_PRIMITIVE_TYPE_FOR_SET:
             return Parser.get_primitive_type(encoding_type_str)
-        encoding_type_node = self.root.find(f'.//types/type[@name="{encoding_type_str}"]')
-        if encoding_type_node == None:
+        encoding_type_node = self.type_node_by_name.get(encoding_type_str)
+        if encoding_type_node == None or encoding_type_node.tag != 'type':
             raise Exception(f'encodingType "{encoding_type_str}" for <set> not found')
-        encoding_type = self.parse_type_from_node(encoding_type_node)
+        encoding_type = self.get_encoded_type_by_name(encoding_type_str)
         primitive_type = encoding_type.primitive_type
         if primitive_type.name not in Parser.VALID_PRIMITIVE_TYPE_FOR_SET:
             raise Exception(f'type "{encoding_type_str}" is not valid for <set> encodingType')
@@ -472,20 +489,30 @@ class Parser:
             raise Exception(f'unknown node type definition (node: "{node.tag}", line: {node.sourceline})')
 
     def get_encoded_type_by_name(self, name: str) -> EncodedType:
+        # return already parsed type
+        encoded_type = self.encoded_type_by_name.get(name)
+        if encoded_type != None:
+            return encoded_type
         # first check type exist in xml
-        node = self.root.find(f'.//types/*[@name="{name}"]')
+        node = self.type_node_by_name.get(name)
         if node != None:
-            return self.parse_encoded_type_from_node(node)
+            encoded_type = self.parse_encoded_type_from_node(node)
         # check type is primitive type
-        if name in Parser.PRIMITIVE_TYPE_BY_NAME:
-            return Parser.get_primitive_type_as_encoded_type(Parser.PRIMITIVE_TYPE_BY_NAME[name])
-        raise Exception(f'encoded type "{name}" not found')
+        elif name in Parser.PRIMITIVE_TYPE_BY_NAME:
+            encoded_type = Parser.get_primitive_type_as_encoded_type(Parser.PRIMITIVE_TYPE_BY_NAME[name])
+        else:
+            raise Exception(f'encoded type "{name}" not found')
+        self.encoded_type_by_name[name] = encoded_type
+        return encoded_type
 
     def get_header(self) -> Composite:
+        if self.header_type != None:
+            return self.header_type
         header_type_str = attr(self.root, 'headerType', 'messageHeader')
         header_type = self.get_encoded_type_by_name(header_type_str)
         if not isinstance(header_type, Composite) or not header_type.is_valid_header_type():
             raise Exception(f'type "{header_type_str}" is not valid header type')
+        self.header_type = header_type
         return header_type
 
     def is_valid_value_ref(self, value_ref: str) -> bool:
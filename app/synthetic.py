@@ -0,0 +1,312 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+'''
+Synthesizer of valid SBE schemas of configurable size (messages, fields, nesting of groups and composites,
+enums, sets and <xi:include> splits) and of encoded messages of schema definition (IR), used by tests and
+benchmarks.
+
+Usage: python -m app.synthetic --output /tmp/large/schema.xml --messages 1000 --fields 50
+'''
+
+import os
+import struct
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from app.generation.python import Generator
+
+SBE_NS = 'http://fixprotocol.io/2016/sbe'
+XI_NS = 'http://www.w3.org/2001/XInclude'
+
+''' Primitive types used by fields (besides enums, sets and composites) '''
+PRIMITIVE_TYPES = [
+    '<type name="Int64" primitiveType="int64"/>',
+    '<type name="UInt32" primitiveType="uint32"/>',
+    '<type name="Int16NULL" primitiveType="int16" presence="optional"/>',
+    '<type name="UInt8" primitiveType="uint8"/>',
+    '<type name="Double" primitiveType="double"/>',
+    '<type name="Symbol" primitiveType="char" length="16"/>'
+]
+
+@dataclass
+class SchemaOptions:
+    messages: int = 100
+    fields: int = 20
+    groups: int = 1
+    group_depth: int = 2
+    group_fields: int = 4
+    data_fields: int = 1
+    composites: int = 10
+    composite_depth: int = 3
+    enums: int = 20
+    enum_values: int = 16
+    sets: int = 10
+    type_files: int = 0
+    message_files: bool = False
+
+class SchemaSynthesizer:
+    '''
+    Write schema described by options. Types could be split between type_files included <types> documents
+    and each message could be placed into its own included document (message_files)
+    '''
+
+    def __init__(self, options: SchemaOptions) -> None:
+        self.options = options
+        # names of types usable by fields by kind (primitive types, enums, sets, composites)
+        self.type_names = []
+
+    def write(self, path: str) -> List[str]:
+        ''' Write schema (and included documents next to it) and return paths of written files '''
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        type_nodes = self.make_type_nodes()
+        written = []
+
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<sbe:messageSchema xmlns:sbe="{SBE_NS}" xmlns:xi="{XI_NS}" package="synthetic" id="1" version="0" byteOrder="littleEndian">',
+            '    <types>',
+            '        <composite name="messageHeader">',
+            '            <type name="blockLength" primitiveType="uint16"/>',
+            '            <type name="templateId" primitiveType="uint16"/>',
+            '            <type name="schemaId" primitiveType="uint16"/>',
+            '            <type name="version" primitiveType="uint16"/>',
+            '        </composite>',
+            '        <composite name="groupSizeEncoding">',
+            '            <type name="blockLength" primitiveType="uint16"/>',
+            '            <type name="numInGroup" primitiveType="uint16"/>',
+            '        </composite>',
+            '        <composite name="varStringEncoding">',
+            '            <type name="length" primitiveType="uint16"/>',
+            '            <type name="varData" primitiveType="uint8" length="0" characterEncoding="UTF-8"/>',
+            '        </composite>'
+        ]
+        if self.options.type_files > 0:
+            lines.append('    </types>')
+            # contiguous chunks keep order of definitions (types are referred to after definition)
+            chunk_size = -(-len(type_nodes) // self.options.type_files)
+            for index in range(self.options.type_files):
+                type_file_name = f'types_{index}.xml'
+                written.append(SchemaSynthesizer.write_lines(f'{directory}/{type_file_name}', [
+                    '<?xml version="1.0" encoding="UTF-8"?>',
+                    '<types>',
+                    *[ f'    {node}' for node in type_nodes[index * chunk_size:(index + 1) * chunk_size] ],
+                    '</types>'
+                ]))
+                lines.append(f'    <xi:include href="{type_file_name}"/>')
+        else:
+            lines.extend(f'        {node}' for node in type_nodes)
+            lines.append('    </types>')
+
+        for index in range(self.options.messages):
+            message_lines = self.make_message_lines(index)
+            if self.options.message_files:
+                message_file_name = f'messages/message_{index}.xml'
+                os.makedirs(f'{directory}/messages', exist_ok=True)
+                message_lines[0] = message_lines[0].replace('<sbe:message ', f'<sbe:message xmlns:sbe="{SBE_NS}" ', 1)
+                written.append(SchemaSynthesizer.write_lines(f'{directory}/{message_file_name}', [
+                    '<?xml version="1.0" encoding="UTF-8"?>',
+                    *message_lines
+                ]))
+                lines.append(f'    <xi:include href="{message_file_name}"/>')
+            else:
+                lines.extend(f'    {line}' for line in message_lines)
+        lines.append('</sbe:messageSchema>')
+
+        written.insert(0, SchemaSynthesizer.write_lines(path, lines))
+        return written
+
+    def make_type_nodes(self) -> List[str]:
+        ''' Return <types> children (each one is a single line) and fill list of type names usable by fields '''
+        nodes = list(PRIMITIVE_TYPES)
+        primitive_names = [ node.split('"')[1] for node in PRIMITIVE_TYPES ]
+        enum_names = []
+        set_names = []
+        composite_names = []
+
+        for index in range(self.options.enums):
+            valid_values = ''.join(f'<validValue name="Value{value}">{value}</validValue>' for value in range(min(self.options.enum_values, 254)))
+            nodes.append(f'<enum name="Enum{index}" encodingType="uint8">{valid_values}</enum>')
+            enum_names.append(f'Enum{index}')
+
+        for index in range(self.options.sets):
+            choices = ''.join(f'<choice name="Bit{choice}">{choice}</choice>' for choice in range(32))
+            nodes.append(f'<set name="Set{index}" encodingType="uint32">{choices}</set>')
+            set_names.append(f'Set{index}')
+
+        for index in range(self.options.composites):
+            # each level refers to the previous one, so depth of the last level is composite_depth
+            for level in range(max(self.options.composite_depth, 1)):
+                members = '<type name="mantissa" primitiveType="int64"/><type name="exponent" primitiveType="int8"/>'
+                if level > 0:
+                    members += f'<ref name="inner" type="Composite{index}Level{level - 1}"/>'
+                    if self.options.enums > 0:
+                        members += f'<ref name="kind" type="Enum{(index + level) % self.options.enums}"/>'
+                nodes.append(f'<composite name="Composite{index}Level{level}">{members}</composite>')
+            composite_names.append(f'Composite{index}Level{max(self.options.composite_depth, 1) - 1}')
+
+        self.type_names = [ names for names in (primitive_names, enum_names, set_names, composite_names) if names ]
+        return nodes
+
+    def make_message_lines(self, index: int) -> List[str]:
+        lines = [ f'<sbe:message name="Message{index}" id="{index + 1}">' ]
+        field_id = 1
+        for field in range(self.options.fields):
+            lines.append(f'    <field name="field{field}" id="{field_id}" type="{self.pick_type(index, field)}"/>')
+            field_id += 1
+        for group in range(self.options.groups):
+            group_lines, field_id = self.make_group_lines(f'group{group}', field_id, self.options.group_depth, index + group)
+            lines.extend(f'    {line}' for line in group_lines)
+        for data in range(self.options.data_fields):
+            lines.append(f'    <data name="data{data}" id="{field_id}" type="varStringEncoding"/>')
+            field_id += 1
+        lines.append('</sbe:message>')
+        return lines
+
+    def make_group_lines(self, name: str, field_id: int, depth: int, seed: int) -> (List[str], int):
+        ''' Return lines of group nested depth levels deep (depth 0 means no group) and next field id '''
+        if depth <= 0:
+            return [], field_id
+        lines = [ f'<group name="{name}" id="{field_id}" dimensionType="groupSizeEncoding">' ]
+        field_id += 1
+        for field in range(self.options.group_fields):
+            lines.append(f'    <field name="field{field}" id="{field_id}" type="{self.pick_type(seed, field)}"/>')
+            field_id += 1
+        nested_lines, field_id = self.make_group_lines('nested', field_id, depth - 1, seed + 1)
+        lines.extend(f'    {line}' for line in nested_lines)
+        for data in range(self.options.data_fields):
+            lines.append(f'    <data name="data{data}" id="{field_id}" type="varStringEncoding"/>')
+            field_id += 1
+        lines.append('</group>')
+        return lines, field_id
+
+    def pick_type(self, seed: int, field: int) -> str:
+        ''' Return type of field, kinds of types alternate between fields '''
+        names = self.type_names[field % len(self.type_names)]
+        return names[(seed + field // len(self.type_names)) % len(names)]
+
+    @staticmethod
+    def write_lines(path: str, lines: List[str]) -> str:
+        with open(path, mode='w', encoding='utf8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+class MessageSynthesizer:
+    '''
+    Build encoded messages (header included) from schema definition (IR). Every field gets some valid
+    non-null value, each group has group_count entries and each var data field is data_length bytes long
+    '''
+
+    def __init__(self, ir: dict, group_count: int = 4, data_length: int = 16) -> None:
+        self.ir = ir
+        self.group_count = group_count
+        self.data_length = data_length
+        self.byte_order = '<' if ir['byte_order'] == 'littleEndian' else '>'
+
+    def make(self, message: dict) -> bytes:
+        header_type = self.ir['header_type']
+        buffer = bytearray(header_type['encoded_length'])
+        self.write_type(buffer, 0, header_type, {
+            'blockLength': message['block_length'],
+            'templateId': message['id'],
+            'schemaId': self.ir['id'],
+            'version': self.ir['version']
+        })
+        self.write_fields(buffer, message['fields'], message['block_length'])
+        return bytes(buffer)
+
+    def write_fields(self, buffer: bytearray, fields: list, block_length: int) -> None:
+        block = bytearray(block_length)
+        for field in fields:
+            if field['token'] == 'field' and field['presence'] != 'constant':
+                self.write_type(block, field['offset'], field['type'])
+        buffer += block
+        for field in fields:
+            if field['token'] == 'group':
+                dimension = bytearray(field['dimension_type']['encoded_length'])
+                self.write_type(dimension, 0, field['dimension_type'], {
+                    'blockLength': field['block_length'],
+                    'numInGroup': self.group_count,
+                    'numGroups': 0,
+                    'numVarDataFields': 0
+                })
+                buffer += dimension
+                for _ in range(self.group_count):
+                    self.write_fields(buffer, field['fields'], field['block_length'])
+            elif field['token'] == 'data':
+                length = bytearray(field['type']['encoded_length'])
+                self.write_type(length, 0, field['type'], { 'length': self.data_length })
+                buffer += length
+                buffer += b'x' * self.data_length
+
+    def write_type(self, buffer: bytearray, offset: int, type: dict, values: Optional[dict] = None, value: Any = None) -> None:
+        if type['token'] == 'composite':
+            for contained in type['contained_types']:
+                contained_value = values.get(contained['reference_name']) if values else None
+                self.write_type(buffer, offset + contained['offset'], contained, value=contained_value)
+        elif type['token'] == 'enum':
+            encoding_type = type['encoding_type']
+            raw = type['valid_values'][0]['value'] if type['valid_values'] else '0'
+            if encoding_type['name'] == 'char':
+                struct.pack_into(f'{self.byte_order}c', buffer, offset, raw.encode('ascii'))
+            else:
+                self.pack_into(buffer, offset, encoding_type['name'], 1, int(raw))
+        elif type['token'] == 'set':
+            raw = 1 << int(type['choices'][0]['value']) if type['choices'] else 0
+            self.pack_into(buffer, offset, type['encoding_type']['name'], 1, raw)
+        elif type['presence'] != 'constant' and type['length'] > 0:
+            primitive_type = type['primitive_type']['name']
+            if primitive_type == 'char':
+                struct.pack_into(f'{type["length"]}s', buffer, offset, b'A' * type['length'])
+            elif primitive_type in ('float', 'double'):
+                self.pack_into(buffer, offset, primitive_type, type['length'], 1.5)
+            else:
+                self.pack_into(buffer, offset, primitive_type, type['length'], MessageSynthesizer.make_int_value(type) if value is None else value)
+
+    def pack_into(self, buffer: bytearray, offset: int, primitive_type: str, length: int, value: Any) -> None:
+        struct.pack_into(f'{self.byte_order}{length}{Generator.filter_struct_fmt(primitive_type)}', buffer, offset, *([value] * length))
+
+    @staticmethod
+    def make_int_value(type: dict) -> int:
+        ''' Return 1 moved into [min_value, max_value] range of type (bounds given by name are ignored) '''
+        value = 1
+        for bound, pick in ((type['min_value'], max), (type['max_value'], min)):
+            try:
+                value = pick(value, int(bound))
+            except (TypeError, ValueError):
+                pass
+        return value
+
+def add_options_arguments(parser: ArgumentParser) -> None:
+    ''' Add command line arguments for every field of SchemaOptions '''
+    defaults = SchemaOptions()
+    parser.add_argument('--messages', help='number of messages', type=int, default=defaults.messages)
+    parser.add_argument('--fields', help='number of fixed fields of every message', type=int, default=defaults.fields)
+    parser.add_argument('--groups', help='number of groups of every message', type=int, default=defaults.groups)
+    parser.add_argument('--group-depth', help='nesting depth of every group', type=int, default=defaults.group_depth)
+    parser.add_argument('--group-fields', help='number of fixed fields of every group', type=int, default=defaults.group_fields)
+    parser.add_argument('--data-fields', help='number of var data fields of every message and group', type=int, default=defaults.data_fields)
+    parser.add_argument('--composites', help='number of composites used by fields', type=int, default=defaults.composites)
+    parser.add_argument('--composite-depth', help='nesting depth of every composite', type=int, default=defaults.composite_depth)
+    parser.add_argument('--enums', help='number of enums', type=int, default=defaults.enums)
+    parser.add_argument('--enum-values', help='number of valid values of every enum', type=int, default=defaults.enum_values)
+    parser.add_argument('--sets', help='number of sets', type=int, default=defaults.sets)
+    parser.add_argument('--type-files', help='split types between number of included documents', type=int, default=defaults.type_files)
+    parser.add_argument('--message-files', help='place every message into its own included document', action='store_true')
+
+def make_options(args) -> SchemaOptions:
+    return SchemaOptions(**{ name: getattr(args, name) for name in SchemaOptions.__dataclass_fields__ })
+
+def main() -> None:
+    parser = ArgumentParser(prog='python -m app.synthetic', description='synthetic SBE schema generator')
+    parser.add_argument('--output', help='path to schema to write (included documents are written next to it)', required=True)
+    add_options_arguments(parser)
+
+    args = parser.parse_args()
+    written = SchemaSynthesizer(make_options(args)).write(args.output)
+    print(f'{len(written)} file(s) written, {sum(os.path.getsize(path) for path in written)} bytes')
+
+if __name__ == '__main__':
+    main()
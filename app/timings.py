@@ -0,0 +1,85 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class Timings:
+    '''
+    Wall time and peak memory (max resident set size of the process at the end of phase) of each phase of
+    the run, render and write time of each document
+    '''
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        # (name, seconds, peak memory in bytes) in order of completion
+        self.phases: List[Tuple[str, float, Optional[int]]] = []
+        # (document name, render seconds, write seconds) in order of completion
+        self.documents: List[Tuple[str, float, float]] = []
+        # name of job running now (batch mode), prefix of names of phases and documents
+        self.job_name: Optional[str] = None
+
+    @contextmanager
+    def job(self, name: Optional[str]) -> Iterator[None]:
+        self.job_name = name
+        try:
+            yield
+        finally:
+            self.job_name = None
+
+    def make_name(self, name: str) -> str:
+        return f'{self.job_name}: {name}' if self.job_name else name
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        name = self.make_name(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start, Timings.get_peak_memory()))
+
+    def add_document(self, document_name: str, render_seconds: float, write_seconds: float) -> None:
+        self.documents.append((self.make_name(document_name), render_seconds, write_seconds))
+
+    @staticmethod
+    def get_peak_memory() -> Optional[int]:
+        ''' Return max resident set size of the process in bytes (None on platforms without resource module) '''
+        if resource is None:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+    @staticmethod
+    def format_memory(value: Optional[int]) -> str:
+        return 'n/a' if value is None else f'{value / (1024 * 1024):.1f} MiB'
+
+    def report(self, top: int) -> str:
+        ''' Return table of phases, totals of document rendering and writing and top slowest documents '''
+        slowest = sorted(self.documents, key=lambda document: document[1] + document[2], reverse=True)[:top]
+        width = max([ 32 ] + [ len(name) for name, _, _ in self.phases ] + [ len(name) for name, _, _ in slowest ])
+
+        lines = [ f'{"phase":<{width}} {"wall time":>10} {"peak memory":>12}' ]
+        for name, seconds, peak_memory in self.phases:
+            lines.append(f'{name:<{width}} {seconds:>9.3f}s {Timings.format_memory(peak_memory):>12}')
+        if self.documents:
+            render_seconds = sum(render for _, render, _ in self.documents)
+            write_seconds = sum(write for _, _, write in self.documents)
+            lines.append(f'{"  render (" + str(len(self.documents)) + " documents)":<{width}} {render_seconds:>9.3f}s')
+            lines.append(f'{"  write":<{width}} {write_seconds:>9.3f}s')
+        lines.append(f'{"total":<{width}} {time.perf_counter() - self.start:>9.3f}s {Timings.format_memory(Timings.get_peak_memory()):>12}')
+
+        if slowest:
+            lines.append('')
+            lines.append(f'{"slowest documents":<{width}} {"render":>10} {"write":>12}')
+            for document_name, render, write in slowest:
+                lines.append(f'{document_name:<{width}} {render:>9.3f}s {write:>11.3f}s')
+        return '\n'.join(lines)
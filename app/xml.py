@@ -5,7 +5,8 @@ from __future__ import annotations
 import os
 import xml.etree.ElementTree as ET
 import xml.etree.ElementInclude as EI
-from typing import ClassVar, Optional, Any
+from urllib.parse import urljoin
+from typing import ClassVar, Optional, Any, Iterator, Tuple
 
 class SentinelClass:
     instance_: ClassVar[Optional[SentinelClass]] = None
@@ -28,6 +29,93 @@ def load_xml_from_file(path: str) -> ET.Element:
 
     return root
 
+def iterparse_xml_from_file(path: str, includes: Tuple[str, ...] = ()) -> Iterator[Tuple[str, ET.Element]]:
+    '''
+    Yield ("start" | "end", element) events while the document is being read. Namespaces are stripped as
+    elements arrive and <xi:include> nodes are replaced in place by the events of the included document.
+    '''
+    if path in includes:
+        raise Exception(f'recursive include of "{path}"')
+    includes = includes + (path,)
+    # chain of currently open elements
+    parents = []
+    # depth inside <xi:include> node (its children are fallback content)
+    include_depth = 0
+
+    for event, el in ET.iterparse(path, events=('start', 'end')):
+        if include_depth > 0 or el.tag == EI.XINCLUDE_INCLUDE:
+            include_depth += 1 if event == 'start' else -1
+            if include_depth > 0 or event == 'start':
+                continue
+            if not parents:
+                raise Exception(f'<xi:include> can\'t be root node of "{path}"')
+            # parser may already have read siblings after <xi:include>, so look up its position from the end
+            parent = parents[-1]
+            index = len(parent) - 1
+            while parent[index] is not el:
+                index -= 1
+            del parent[index]
+            href = urljoin(path, attr(el, 'href'))
+            parse = attr(el, 'parse', 'xml')
+            if parse == 'xml':
+                included_events = iterparse_xml_from_file(href, includes)
+                _, included_root = next(included_events)
+                included_root.tail = el.tail
+                parent.insert(index, included_root)
+                yield 'start', included_root
+                yield from included_events
+            elif parse == 'text':
+                text = EI.default_loader(href, parse, attr(el, 'encoding', None))
+                if index > 0:
+                    parent[index - 1].tail = (parent[index - 1].tail or '') + text + (el.tail or '')
+                else:
+                    parent.text = (parent.text or '') + text + (el.tail or '')
+            else:
+                raise Exception(f'unknown parse type "{parse}" in <xi:include>')
+            continue
+
+        if event == 'start':
+            _, _, el.tag = el.tag.rpartition('}')
+            parents.append(el)
+        else:
+            parents.pop()
+        yield event, el
+
+def stream_xml_from_file(path: str, tag: str) -> Tuple[ET.Element, Iterator[ET.Element]]:
+    '''
+    Load document until the first top level node named tag and return root node and iterator over
+    top level tag nodes. Each node is loaded lazily and freed once the consumer advances the iterator.
+    '''
+    events = iterparse_xml_from_file(path)
+    _, root = next(events)
+    depth = 1
+
+    for event, el in events:
+        if event == 'start':
+            depth += 1
+            if depth == 2 and el.tag == tag:
+                break
+        else:
+            depth -= 1
+    else:
+        return root, iter(())
+
+    def iter_nodes() -> Iterator[ET.Element]:
+        depth = 2
+        for event, el in events:
+            if event == 'start':
+                depth += 1
+                if depth == 2 and el.tag == 'types':
+                    raise Exception(f'<types> after <{tag}> is not supported by streaming loader')
+            else:
+                if depth == 2 and el.tag == tag:
+                    yield el
+                    root.remove(el)
+                    el.clear()
+                depth -= 1
+
+    return root, iter_nodes()
+
 def attr(node: ET.Element, name: str, default: Any = SENTINEL, cast = SENTINEL) -> Any:
     if name in node.attrib:
         if isinstance(cast, SentinelClass):
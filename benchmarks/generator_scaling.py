@@ -0,0 +1,122 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+'''
+Scaling benchmark of schema parsing and code generation.
+
+Synthetic schemas (see app.synthetic) of growing size are parsed and generated. Every phase
+is timed separately: xml loading (Parser.from_file), Parser.get_schema, IR construction
+(GeneratorBase.make_schema_definition) and _generate_impl of each backend. The report shows how time of
+each phase grows with size (exponent of power law fitted to timings).
+
+Usage: python -m benchmarks.generator_scaling --sizes 10,100,1000 [--scale fields] [--output report.json]
+'''
+
+import contextlib
+import importlib
+import io
+import json
+import math
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from dataclasses import replace
+from typing import Any, Callable, Dict, List
+
+from app.parser import Parser
+from app.generator import GeneratorBase
+from app.synthetic import SchemaOptions, SchemaSynthesizer, add_options_arguments, make_options
+
+BACKENDS = [ 'cpp', 'cpp-min', 'python' ]
+
+def measure(fn: Callable[[int], Any], repeat: int) -> float:
+    ''' Return the best of repeat runs of fn(run index) in seconds '''
+    best = math.inf
+    for index in range(repeat):
+        start = time.perf_counter()
+        fn(index)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def fit_exponent(sizes: List[int], seconds: List[float]) -> float:
+    ''' Return exponent k of seconds ~ size^k (least squares fit in log-log scale) '''
+    xs = [ math.log(size) for size in sizes ]
+    ys = [ math.log(max(value, 1e-9)) for value in seconds ]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return math.nan
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+def benchmark_size(options: SchemaOptions, directory: str, backends: List[str], repeat: int, streaming: bool, jobs: int) -> Dict[str, float]:
+    schema_path = f'{directory}/schema/schema.xml'
+    SchemaSynthesizer(options).write(schema_path)
+
+    phases = {}
+    phases['load_xml'] = measure(lambda index: Parser.from_file(schema_path, streaming=streaming), repeat)
+    # streaming parser consumes message nodes, so every run needs its own parser
+    parsers = [ Parser.from_file(schema_path, streaming=streaming) for _ in range(repeat) ]
+    phases['get_schema'] = measure(lambda index: parsers[index].get_schema(), repeat)
+    schema = Parser.from_file(schema_path, streaming=streaming).get_schema()
+    phases['ir'] = measure(lambda index: GeneratorBase.make_schema_definition(schema), repeat)
+    ir = GeneratorBase.make_schema_definition(schema)
+
+    for backend in backends:
+        Generator = getattr(importlib.import_module(f'app.generation.{backend}'), 'Generator')
+        generator_options = { 'jobs': jobs } if backend == 'cpp' else {}
+        # every run writes into empty directory, so no document is skipped as up to date
+        with contextlib.redirect_stdout(io.StringIO()):
+            phases[f'generate:{backend}'] = measure(lambda index: Generator(f'{directory}/{backend}/{index}', **generator_options)._generate_impl(ir), repeat)
+
+    return phases
+
+def main() -> None:
+    scalable = [ name for name, value in SchemaOptions.__dataclass_fields__.items() if value.type in (int, 'int') ]
+
+    parser = ArgumentParser(prog='python -m benchmarks.generator_scaling', description='parse and generate time scaling benchmark')
+    parser.add_argument('--sizes', help='comma separated values of scaled option', default='10,100,1000')
+    parser.add_argument('--scale', help='option of synthetic schema changed between runs', choices=scalable, default='messages')
+    parser.add_argument('--backend', help='backend to benchmark (default: all)', action='append', choices=BACKENDS)
+    parser.add_argument('--repeat', help='number of runs of every phase (the best one is reported)', type=int, default=3)
+    parser.add_argument('--streaming', help='load schema incrementally', action='store_true')
+    parser.add_argument('--jobs', help='number of processes used for rendering documents (cpp backend)', type=int, default=1)
+    parser.add_argument('--output', help='path to JSON report')
+    add_options_arguments(parser)
+
+    args = parser.parse_args()
+    sizes = [ int(size) for size in args.sizes.split(',') ]
+    options = make_options(args)
+
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            phases = benchmark_size(replace(options, **{ args.scale: size }), directory, args.backend or BACKENDS, args.repeat, args.streaming, args.jobs)
+        results.append(phases)
+        print(f'{args.scale}={size}: ' + ', '.join(f'{name} {seconds:.3f}s' for name, seconds in phases.items()), file=sys.stderr)
+
+    report = {
+        'scale': args.scale,
+        'sizes': sizes,
+        'options': vars(options),
+        'phases': {}
+    }
+    for name in results[0]:
+        seconds = [ phases[name] for phases in results ]
+        report['phases'][name] = {
+            'seconds': seconds,
+            'exponent': fit_exponent(sizes, seconds) if len(sizes) > 1 else None
+        }
+
+    name_width = max(len(name) for name in report['phases'])
+    print(f'{"phase":<{name_width}} ' + ' '.join(f'{size:>10}' for size in sizes) + '   exponent')
+    for name, phase in report['phases'].items():
+        exponent = '' if phase['exponent'] is None else f'{phase["exponent"]:.2f}'
+        print(f'{name:<{name_width}} ' + ' '.join(f'{seconds:>9.3f}s' for seconds in phase['seconds']) + f'   {exponent:>8}')
+
+    if args.output:
+        with open(args.output, mode='w', encoding='utf8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
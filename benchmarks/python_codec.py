@@ -0,0 +1,190 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+'''
+Throughput benchmark of generated python codec.
+
+For every schema python codec is generated, a message of every type is synthesized (groups and var data
+included), then encode and decode rates (messages/sec) and memory allocated per message (tracemalloc) are
+measured. Results are written as JSON, runs are compared with --baseline.
+
+Usage: python -m benchmarks.python_codec [--output results.json] [--baseline previous.json]
+'''
+
+import importlib.util
+import json
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict
+
+from app.parser import Parser
+from app.generator import GeneratorBase
+from app.generation.python import Generator
+from app.synthetic import MessageSynthesizer
+
+RESOURCES_DIR = pathlib.Path(__file__).parent.parent.resolve() / 'resources'
+
+SCHEMAS = [ 'spot_3_1', 'b3-market-data-messages-1.3.1', 'FixBinary' ]
+
+def load_codec(ir: dict, name: str, directory: str, record: str) -> Any:
+    ''' Generate python codec for schema definition and import it '''
+    Generator(f'{directory}/{name}', record=record).generate_from_definition(ir)
+    spec = importlib.util.spec_from_file_location(f'sbe_benchmark_{len(sys.modules)}', f'{directory}/{name}/schema.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def measure_rate(fn: Callable[[], Any], min_time: float) -> float:
+    ''' Return number of fn() calls per second '''
+    count = 0
+    batch = 1
+    elapsed = 0.0
+    while elapsed < min_time:
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        elapsed += time.perf_counter() - start
+        count += batch
+        batch *= 2
+    return count / elapsed
+
+def measure_allocations(fn: Callable[[], Any], filename: str, count: int) -> dict:
+    '''
+    Return memory allocated by codec per fn() call: blocks and bytes still held by returned values (decoded
+    message) and peak of memory in use during a call. Only allocations done by codec module are counted
+    '''
+    filters = [ tracemalloc.Filter(True, filename) ]
+    fn()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] - current
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        results = [ fn() for _ in range(count) ]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    del results
+    return {
+        'retained_blocks': sum(stat.count_diff for stat in stats) / count,
+        'retained_bytes': sum(stat.size_diff for stat in stats) / count,
+        'peak_bytes': peak
+    }
+
+def benchmark_message(codec: Any, message: dict, data: bytes, min_time: float) -> dict:
+    cls = codec.Schema.getCodecCls(message['id'])
+    value = codec.Schema.decode(codec.CodecContext(data))
+    output = bytearray(len(data))
+
+    def decode() -> Any:
+        return codec.Schema.decode(codec.CodecContext(data))
+
+    def encode() -> None:
+        codec.Schema.encode(codec.CodecContext(output), value, cls=cls)
+
+    encode()
+    result = {
+        'size': len(data),
+        'roundtrip': bytes(output) == data
+    }
+    for name, fn in (('encode', encode), ('decode', decode)):
+        rate = measure_rate(fn, min_time)
+        result[name] = {
+            'messages_per_second': rate,
+            'megabytes_per_second': rate * len(data) / 1e6,
+            **measure_allocations(fn, codec.__file__, 100)
+        }
+    return result
+
+def summarize(messages: Dict[str, dict]) -> dict:
+    ''' Return rates of stream containing one message of each type '''
+    summary = {}
+    for name in ('encode', 'decode'):
+        seconds = sum(1.0 / result[name]['messages_per_second'] for result in messages.values())
+        summary[name] = {
+            'messages_per_second': len(messages) / seconds,
+            'megabytes_per_second': sum(result['size'] for result in messages.values()) / seconds / 1e6,
+            'retained_blocks': sum(result[name]['retained_blocks'] for result in messages.values()) / len(messages)
+        }
+    return summary
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    ''' Return descriptions of rates dropped by more than tolerance and of allocations grown (by a block per message) since baseline '''
+    regressions = []
+    for schema_name, schema in results['schemas'].items():
+        for message_name, message in schema['messages'].items():
+            previous = baseline.get('schemas', {}).get(schema_name, {}).get('messages', {}).get(message_name)
+            if previous is None:
+                continue
+            for name in ('encode', 'decode'):
+                rate, previous_rate = message[name]['messages_per_second'], previous[name]['messages_per_second']
+                if rate < previous_rate * (1.0 - tolerance):
+                    regressions.append(f'{schema_name}.{message_name} {name}: {previous_rate:.0f} -> {rate:.0f} msg/s')
+                blocks, previous_blocks = message[name]['retained_blocks'], previous[name]['retained_blocks']
+                if blocks > previous_blocks + 1.0:
+                    regressions.append(f'{schema_name}.{message_name} {name}: {previous_blocks:.1f} -> {blocks:.1f} blocks/msg')
+    return regressions
+
+def main() -> None:
+    parser = ArgumentParser(prog='python -m benchmarks.python_codec', description='python codec throughput benchmark')
+    parser.add_argument('--schema', help='schema from resources directory (default: all)', action='append', choices=SCHEMAS)
+    parser.add_argument('--record', help='type of decoded messages', choices=Generator.RECORDS, default='dict')
+    parser.add_argument('--group-count', help='number of entries of every group', type=int, default=4)
+    parser.add_argument('--data-length', help='length of every var data field', type=int, default=16)
+    parser.add_argument('--min-time', help='minimal measurement time per message and operation (seconds)', type=float, default=0.05)
+    parser.add_argument('--output', help='path to JSON report (default: stdout)')
+    parser.add_argument('--baseline', help='path to JSON report of previous run to compare with')
+    parser.add_argument('--tolerance', help='allowed relative drop of rate against baseline', type=float, default=0.1)
+
+    args = parser.parse_args()
+
+    results = {
+        'python': platform.python_version(),
+        'record': args.record,
+        'group_count': args.group_count,
+        'data_length': args.data_length,
+        'schemas': {}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for schema_name in args.schema or SCHEMAS:
+            ir = GeneratorBase.make_schema_definition(Parser.from_file(f'{RESOURCES_DIR}/{schema_name}.xml').get_schema())
+            codec = load_codec(ir, schema_name, directory, args.record)
+            synthesizer = MessageSynthesizer(ir, args.group_count, args.data_length)
+            messages = {}
+            for message in ir['messages']:
+                messages[message['name']] = benchmark_message(codec, message, synthesizer.make(message), args.min_time)
+            summary = summarize(messages)
+            results['schemas'][schema_name] = { 'summary': summary, 'messages': messages }
+            print(f'{schema_name}: encode {summary["encode"]["messages_per_second"]:.0f} msg/s, '
+                  f'decode {summary["decode"]["messages_per_second"]:.0f} msg/s, '
+                  f'{summary["decode"]["retained_blocks"]:.1f} blocks/msg decoded', file=sys.stderr)
+            for message_name, message in messages.items():
+                if not message['roundtrip']:
+                    print(f'warning: {schema_name}.{message_name} is not encoded back to the same bytes', file=sys.stderr)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, mode='w', encoding='utf8') as f:
+            f.write(report)
+    else:
+        print(report)
+
+    if args.baseline:
+        with open(args.baseline, mode='r', encoding='utf8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f'regression: {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
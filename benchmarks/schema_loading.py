@@ -0,0 +1,93 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+'''
+Memory and time benchmark of schema loading.
+
+Bundled schemas and a synthetic one (see app.synthetic) are loaded into Schema by the
+default loader (whole document is parsed and included documents are resolved before Parser walks it)
+and by the streaming one (--streaming, messages are parsed one at a time). Wall time (the best of
+runs) and peak of memory traced by tracemalloc are reported for each of them.
+
+Usage: python -m benchmarks.schema_loading [--messages 10000] [--output report.json]
+'''
+
+import gc
+import json
+import math
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from typing import Dict
+
+from app.parser import Parser
+from app.synthetic import SchemaSynthesizer, add_options_arguments, make_options
+
+RESOURCES_DIR = pathlib.Path(__file__).parent.parent.resolve() / 'resources'
+
+SCHEMAS = [ 'spot_3_1', 'b3-market-data-messages-1.3.1', 'FixBinary' ]
+
+LOADERS = { 'default': False, 'streaming': True }
+
+def load(path: str, streaming: bool) -> None:
+    Parser.from_file(path, streaming=streaming).get_schema()
+
+def measure_time(path: str, streaming: bool, repeat: int) -> float:
+    ''' Return the best of repeat loads in seconds '''
+    best = math.inf
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        load(path, streaming)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure_peak(path: str, streaming: bool) -> int:
+    ''' Return peak of memory allocated while loading in bytes '''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        load(path, streaming)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_schema(path: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    return {
+        loader: { 'seconds': measure_time(path, streaming, repeat), 'peak_bytes': measure_peak(path, streaming) }
+        for loader, streaming in LOADERS.items()
+    }
+
+def main() -> None:
+    parser = ArgumentParser(prog='python -m benchmarks.schema_loading', description='schema loading memory and time benchmark')
+    parser.add_argument('--repeat', help='number of timed loads (the best one is reported)', type=int, default=3)
+    parser.add_argument('--output', help='path to JSON report')
+    add_options_arguments(parser)
+    parser.set_defaults(messages=10000)
+
+    args = parser.parse_args()
+    options = make_options(args)
+
+    report = {}
+    for name in SCHEMAS:
+        report[name] = benchmark_schema(f'{RESOURCES_DIR}/{name}.xml', args.repeat)
+        print(f'{name} done', file=sys.stderr)
+    with tempfile.TemporaryDirectory() as directory:
+        SchemaSynthesizer(options).write(f'{directory}/schema.xml')
+        name = f'synthetic ({options.messages} messages)'
+        report[name] = benchmark_schema(f'{directory}/schema.xml', args.repeat)
+
+    name_width = max(len(name) for name in report)
+    print(f'{"schema":<{name_width}} ' + ' '.join(f'{loader + " time":>16} {loader + " peak":>16}' for loader in LOADERS))
+    for name, loaders in report.items():
+        print(f'{name:<{name_width}} ' + ' '.join(f'{value["seconds"]:>15.3f}s {value["peak_bytes"] / (1 << 20):>13.1f}MiB' for value in loaders.values()))
+
+    if args.output:
+        with open(args.output, mode='w', encoding='utf8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+// ------------------------------------------------------------
+// Copyright 2022-present Sergey Kovalevich <inndie@gmail.com>
+// ------------------------------------------------------------
+
+#pragma once
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <print>
+#include <string_view>
+
+namespace bm {
+
+// number of timed runs of benchmark body (warm up takes 1/10 of it)
+inline constexpr std::size_t kIterations = 1000;
+
+// prevent compiler from optimizing out computation of value
+template <typename T>
+inline void doNotOptimize(T const& value) {
+    asm volatile("" : : "r,m"(value) : "memory");
+}
+
+// run fn() and print time per call (ns/msg) and throughput (GB/s) given fn() processes bytes on each call
+template <typename Fn>
+void run(std::string_view name, std::size_t bytes, Fn&& fn) {
+    for (std::size_t i = 0; i < kIterations / 10; ++i) {
+        doNotOptimize(fn());
+    }
+
+    auto const start = std::chrono::steady_clock::now();
+    for (std::size_t i = 0; i < kIterations; ++i) {
+        doNotOptimize(fn());
+    }
+    auto const elapsed = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - start).count();
+
+    auto const nsPerMessage = elapsed / kIterations;
+    std::print("{:<36} {:>12.1f} ns/msg {:>8.2f} GB/s\n", name, nsPerMessage,
+        static_cast<double>(bytes) / nsPerMessage);
+}
+
+} // namespace bm
@@ -0,0 +1,77 @@
+// ------------------------------------------------------------
+// Copyright 2022-present Sergey Kovalevich <inndie@gmail.com>
+// ------------------------------------------------------------
+
+#include <bit>
+#include <cstddef>
+#include <cstdint>
+#include <cstdlib>
+#include <print>
+#include <span>
+
+#include "bm.h"
+#include "spot_checked/schema.h"
+#include "spot_unchecked/schema.h"
+
+namespace content {
+
+#include "Binance_ticker_data.h"
+
+} // namespace content
+
+namespace {
+
+// read a few fields of every ticker (including trailing symbol) to keep decoding from being optimized out
+template <typename Message>
+auto decodeTickers(Message message) -> std::int64_t {
+    std::int64_t checksum = 0;
+    auto tickers = message.template get<"tickers">();
+    while (tickers.hasNext()) {
+        tickers.next();
+        checksum += tickers.template get<"lastPrice">().value();
+        checksum += tickers.template get<"bidQty">().value();
+        checksum += tickers.template get<"numTrades">().value();
+        checksum += static_cast<std::int64_t>(tickers.template get<"symbol">().value().size());
+    }
+    return checksum;
+}
+
+template <typename Header, typename Message>
+auto decodeFrame(std::span<std::byte> buffer) -> std::int64_t {
+    auto header = Header{buffer.data()};
+    return decodeTickers(Message(buffer, header.sbeEncodedLength(), header.template get<"blockLength">().value(),
+        header.template get<"version">().value()));
+}
+
+} // namespace
+
+int main() {
+    auto const buffer =
+        std::span<std::byte>(std::bit_cast<std::byte*>((unsigned char*)content::ticker), content::ticker_len);
+
+    if (!spot_checked::validate(buffer)) {
+        std::print(stderr, "ERROR: invalid message\n");
+        return EXIT_FAILURE;
+    }
+
+    bm::run("validate", buffer.size(), [buffer] {
+        return spot_unchecked::validate(buffer) ? 1 : 0;
+    });
+
+    bm::run("decode (throw)", buffer.size(), [buffer] {
+        return decodeFrame<spot_checked::MessageHeader, spot_checked::Ticker24hFullResponse>(buffer);
+    });
+
+    bm::run("decode (none)", buffer.size(), [buffer] {
+        return decodeFrame<spot_unchecked::MessageHeader, spot_unchecked::Ticker24hFullResponse>(buffer);
+    });
+
+    bm::run("validate + decode (none)", buffer.size(), [buffer] -> std::int64_t {
+        if (!spot_unchecked::validate(buffer)) [[unlikely]] {
+            return 0;
+        }
+        return decodeFrame<spot_unchecked::MessageHeader, spot_unchecked::Ticker24hFullResponse>(buffer);
+    });
+
+    return EXIT_SUCCESS;
+}
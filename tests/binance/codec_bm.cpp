@@ -0,0 +1,268 @@
+// ------------------------------------------------------------
+// Copyright 2022-present Sergey Kovalevich <inndie@gmail.com>
+// ------------------------------------------------------------
+
+#include <algorithm>
+#include <array>
+#include <bit>
+#include <cstddef>
+#include <cstdint>
+#include <cstdlib>
+#include <format>
+#include <iterator>
+#include <print>
+#include <span>
+#include <string>
+#include <string_view>
+#include <utility>
+#include <vector>
+
+#include "bm.h"
+#include "spot_checked/schema.h"
+#include "spot_cpp/schema.h"
+
+namespace content {
+
+#include "Binance_ticker_data.h"
+
+} // namespace content
+
+namespace {
+
+// codecs generated from the same schema by cpp and cpp-min backends
+struct CppCodec {
+    static constexpr std::string_view kName = "cpp";
+
+    using MessageHeader = spot_cpp::MessageHeader;
+    using Ticker24hFullResponse = spot_cpp::Ticker24hFullResponse;
+
+    template <typename Visitor>
+    static auto dispatch(std::span<std::byte> buffer, Visitor&& visitor) -> bool {
+        return spot_cpp::dispatch(buffer, std::forward<Visitor>(visitor)) == spot_cpp::DispatchResult::Ok;
+    }
+};
+
+struct CppMinCodec {
+    static constexpr std::string_view kName = "cpp-min";
+
+    using MessageHeader = spot_checked::MessageHeader;
+    using Ticker24hFullResponse = spot_checked::Ticker24hFullResponse;
+
+    template <typename Visitor>
+    static auto dispatch(std::span<std::byte> buffer, Visitor&& visitor) -> bool {
+        return spot_checked::dispatch(buffer, std::forward<Visitor>(visitor)) == spot_checked::DispatchResult::Ok;
+    }
+};
+
+// decoded ticker (source of encode benchmark)
+struct Ticker {
+    std::int8_t priceExponent;
+    std::int8_t qtyExponent;
+    std::int64_t priceChange;
+    float priceChangePercent;
+    std::int64_t weightedAvgPrice;
+    std::int64_t prevClosePrice;
+    std::int64_t lastPrice;
+    std::array<std::uint8_t, 16> lastQty;
+    std::int64_t bidPrice;
+    std::int64_t bidQty;
+    std::int64_t askPrice;
+    std::int64_t askQty;
+    std::int64_t openPrice;
+    std::int64_t highPrice;
+    std::int64_t lowPrice;
+    std::array<std::uint8_t, 16> volume;
+    std::array<std::uint8_t, 16> quoteVolume;
+    std::int64_t openTime;
+    std::int64_t closeTime;
+    std::int64_t firstId;
+    std::int64_t lastId;
+    std::int64_t numTrades;
+    std::string symbol;
+};
+
+template <typename Codec>
+auto decodeMessage(std::span<std::byte> buffer) -> typename Codec::Ticker24hFullResponse {
+    auto header = typename Codec::MessageHeader{buffer.data()};
+    return typename Codec::Ticker24hFullResponse(buffer, header.sbeEncodedLength(),
+        header.template get<"blockLength">().value(), header.template get<"version">().value());
+}
+
+template <typename Group>
+auto sum(Group& group) -> std::int64_t {
+    return group.template get<"priceExponent">().value() + group.template get<"qtyExponent">().value() +
+           group.template get<"priceChange">().value() +
+           std::bit_cast<std::int32_t>(group.template get<"priceChangePercent">().value()) +
+           group.template get<"weightedAvgPrice">().value() + group.template get<"prevClosePrice">().value() +
+           group.template get<"lastPrice">().value() + group.template get<"lastQty">().value()[0] +
+           group.template get<"bidPrice">().value() + group.template get<"bidQty">().value() +
+           group.template get<"askPrice">().value() + group.template get<"askQty">().value() +
+           group.template get<"openPrice">().value() + group.template get<"highPrice">().value() +
+           group.template get<"lowPrice">().value() + group.template get<"volume">().value()[0] +
+           group.template get<"quoteVolume">().value()[0] + group.template get<"openTime">().value() +
+           group.template get<"closeTime">().value() + group.template get<"firstId">().value() +
+           group.template get<"lastId">().value() + group.template get<"numTrades">().value();
+}
+
+template <typename Codec>
+auto readTickers(std::span<std::byte> buffer) -> std::vector<Ticker> {
+    auto result = std::vector<Ticker>();
+    auto message = decodeMessage<Codec>(buffer);
+    auto tickers = message.template get<"tickers">();
+    while (tickers.hasNext()) {
+        tickers.next();
+        auto& ticker = result.emplace_back();
+        ticker.priceExponent = tickers.template get<"priceExponent">().value();
+        ticker.qtyExponent = tickers.template get<"qtyExponent">().value();
+        ticker.priceChange = tickers.template get<"priceChange">().value();
+        ticker.priceChangePercent = tickers.template get<"priceChangePercent">().value();
+        ticker.weightedAvgPrice = tickers.template get<"weightedAvgPrice">().value();
+        ticker.prevClosePrice = tickers.template get<"prevClosePrice">().value();
+        ticker.lastPrice = tickers.template get<"lastPrice">().value();
+        std::ranges::copy(tickers.template get<"lastQty">().value(), ticker.lastQty.begin());
+        ticker.bidPrice = tickers.template get<"bidPrice">().value();
+        ticker.bidQty = tickers.template get<"bidQty">().value();
+        ticker.askPrice = tickers.template get<"askPrice">().value();
+        ticker.askQty = tickers.template get<"askQty">().value();
+        ticker.openPrice = tickers.template get<"openPrice">().value();
+        ticker.highPrice = tickers.template get<"highPrice">().value();
+        ticker.lowPrice = tickers.template get<"lowPrice">().value();
+        std::ranges::copy(tickers.template get<"volume">().value(), ticker.volume.begin());
+        std::ranges::copy(tickers.template get<"quoteVolume">().value(), ticker.quoteVolume.begin());
+        ticker.openTime = tickers.template get<"openTime">().value();
+        ticker.closeTime = tickers.template get<"closeTime">().value();
+        ticker.firstId = tickers.template get<"firstId">().value();
+        ticker.lastId = tickers.template get<"lastId">().value();
+        ticker.numTrades = tickers.template get<"numTrades">().value();
+        ticker.symbol = tickers.template get<"symbol">().value();
+    }
+    return result;
+}
+
+template <typename Codec>
+auto encodeTickers(std::span<std::byte> buffer, std::vector<Ticker> const& source) -> std::size_t {
+    auto message = Codec::Ticker24hFullResponse::wrapAndApplyHeader(buffer);
+    auto tickers = message.template get<"tickers">();
+    tickers.reset(source.size());
+    for (auto const& ticker : source) {
+        tickers.next();
+        tickers.template get<"priceExponent">().value(ticker.priceExponent);
+        tickers.template get<"qtyExponent">().value(ticker.qtyExponent);
+        tickers.template get<"priceChange">().value(ticker.priceChange);
+        tickers.template get<"priceChangePercent">().value(ticker.priceChangePercent);
+        tickers.template get<"weightedAvgPrice">().value(ticker.weightedAvgPrice);
+        tickers.template get<"prevClosePrice">().value(ticker.prevClosePrice);
+        tickers.template get<"lastPrice">().value(ticker.lastPrice);
+        tickers.template get<"lastQty">().value(ticker.lastQty);
+        tickers.template get<"bidPrice">().value(ticker.bidPrice);
+        tickers.template get<"bidQty">().value(ticker.bidQty);
+        tickers.template get<"askPrice">().value(ticker.askPrice);
+        tickers.template get<"askQty">().value(ticker.askQty);
+        tickers.template get<"openPrice">().value(ticker.openPrice);
+        tickers.template get<"highPrice">().value(ticker.highPrice);
+        tickers.template get<"lowPrice">().value(ticker.lowPrice);
+        tickers.template get<"volume">().value(ticker.volume);
+        tickers.template get<"quoteVolume">().value(ticker.quoteVolume);
+        tickers.template get<"openTime">().value(ticker.openTime);
+        tickers.template get<"closeTime">().value(ticker.closeTime);
+        tickers.template get<"firstId">().value(ticker.firstId);
+        tickers.template get<"lastId">().value(ticker.lastId);
+        tickers.template get<"numTrades">().value(ticker.numTrades);
+        tickers.template get<"symbol">().value(ticker.symbol);
+    }
+    return message.position();
+}
+
+template <typename Codec>
+void runCodec(std::span<std::byte> buffer) {
+    auto const label = [](std::string_view name) {
+        return std::format("{} {}", Codec::kName, name);
+    };
+
+    auto const headerSize = typename Codec::MessageHeader{buffer.data()}.sbeEncodedLength();
+
+    // only header is decoded
+    bm::run(label("dispatch"), headerSize, [buffer] {
+        std::size_t dispatched = 0;
+        Codec::dispatch(buffer, [&dispatched](auto const&) {
+            ++dispatched;
+        });
+        return dispatched;
+    });
+
+    bm::run(label("traverse (fixed fields)"), buffer.size(), [buffer] {
+        std::int64_t checksum = 0;
+        auto message = decodeMessage<Codec>(buffer);
+        auto tickers = message.template get<"tickers">();
+        while (tickers.hasNext()) {
+            tickers.next();
+            checksum += sum(tickers);
+            tickers.template get<"symbol">().skip();
+        }
+        return checksum;
+    });
+
+    bm::run(label("traverse (var data)"), buffer.size(), [buffer] {
+        std::size_t length = 0;
+        auto message = decodeMessage<Codec>(buffer);
+        auto tickers = message.template get<"tickers">();
+        while (tickers.hasNext()) {
+            tickers.next();
+            length += tickers.template get<"symbol">().value().size();
+        }
+        return length;
+    });
+
+    auto output = std::string();
+    bm::run(label("format"), buffer.size(), [buffer, &output] {
+        output.clear();
+        auto message = decodeMessage<Codec>(buffer);
+        auto tickers = message.template get<"tickers">();
+        while (tickers.hasNext()) {
+            tickers.next();
+            auto const lastPrice = tickers.template get<"lastPrice">().value();
+            auto const bidQty = tickers.template get<"bidQty">().value();
+            auto const askQty = tickers.template get<"askQty">().value();
+            auto const numTrades = tickers.template get<"numTrades">().value();
+            std::format_to(std::back_inserter(output), "{} {} {} {} {}\n", tickers.template get<"symbol">().value(),
+                lastPrice, bidQty, askQty, numTrades);
+        }
+        return output.size();
+    });
+
+    if constexpr (requires { decodeMessage<Codec>(buffer).asJson(); }) {
+        bm::run(label("json"), buffer.size(), [buffer] {
+            return decodeMessage<Codec>(buffer).asJson().dump().size();
+        });
+    }
+
+    auto const source = readTickers<Codec>(buffer);
+    auto storage = std::vector<std::byte>(buffer.size());
+    auto const encodedSize = encodeTickers<Codec>(storage, source);
+    // header is skipped, capture could be produced by newer schema version
+    if (encodedSize != buffer.size() ||
+        !std::ranges::equal(std::span(storage).subspan(headerSize, encodedSize - headerSize), buffer.subspan(headerSize))) {
+        std::print(stderr, "WARNING: {} re-encoded message differs from source\n", Codec::kName);
+    }
+    bm::run(label("encode"), encodedSize, [&storage, &source] {
+        return encodeTickers<Codec>(storage, source);
+    });
+}
+
+} // namespace
+
+int main() {
+    auto const buffer =
+        std::span<std::byte>(std::bit_cast<std::byte*>((unsigned char*)content::ticker), content::ticker_len);
+
+    if (!spot_checked::validate(buffer) || !spot_cpp::validate(buffer)) {
+        std::print(stderr, "ERROR: invalid message\n");
+        return EXIT_FAILURE;
+    }
+
+    std::print("Ticker24hFullResponse, {} bytes\n", buffer.size());
+    runCodec<CppCodec>(buffer);
+    runCodec<CppMinCodec>(buffer);
+
+    return EXIT_SUCCESS;
+}
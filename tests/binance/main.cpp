@@ -26,10 +26,14 @@ int main([[maybe_unused]] int argc, [[maybe_unused]] char* argv[]) {
         [[maybe_unused]] auto buffer2 =
             std::span<std::byte>(std::bit_cast<std::byte*>((unsigned char*)content::ticker), content::ticker_len);
 
-        auto header = spot_sbe::MessageHeader{buffer2.data()};
-        if (header.get<"templateId">().value() == spot_sbe::Ticker24hFullResponse::sbeTemplateId()) {
-            [[maybe_unused]] auto body = spot_sbe::Ticker24hFullResponse(buffer2, header.sbeEncodedLength(),
-                header.get<"blockLength">().value(), header.get<"version">().value());
+        auto const result = spot_sbe::dispatch(buffer2, [](auto const& message) {
+            using Message = std::remove_cvref_t<decltype(message)>;
+            if constexpr (std::is_same_v<Message, spot_sbe::Ticker24hFullResponse>) {
+                std::print("{} (block length {})\n", Message::sbeMessageName(), message.actingBlockLength());
+            }
+        });
+        if (result != spot_sbe::DispatchResult::Ok) {
+            std::print(stderr, "failed to dispatch message ({})\n", static_cast<int>(result));
         }
 
     } catch (std::exception const& e) {
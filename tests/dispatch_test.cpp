@@ -0,0 +1,112 @@
+// Copyright (c) Sergey Kovalevich <inndie@gmail.com>
+
+#include <array>
+#include <cstddef>
+#include <span>
+
+#include <doctest/doctest.h>
+
+#include "schema.h"
+
+namespace {
+
+template <typename... Ts>
+struct Overloaded : Ts... {
+    using Ts::operator()...;
+};
+
+} // namespace
+
+TEST_CASE("dispatch: known message") {
+    auto storage = std::array<std::byte, 64>{};
+    auto buffer = std::span<std::byte>(storage);
+    [[maybe_unused]] auto const encoded = spot_sbe::PriceFilter::wrapAndApplyHeader(buffer);
+
+    std::size_t priceFilterCount = 0;
+    std::size_t otherCount = 0;
+    auto const result = spot_sbe::dispatch(buffer, Overloaded{
+        [&](spot_sbe::PriceFilter const& message) {
+            REQUIRE_EQ(message.offset(), spot_sbe::MessageHeader::sbeEncodedLength());
+            REQUIRE_EQ(message.actingBlockLength(), spot_sbe::PriceFilter::sbeBlockLength());
+            REQUIRE_EQ(message.actingVersion(), spot_sbe::PriceFilter::sbeVersion());
+            ++priceFilterCount;
+        },
+        [&](auto const&) {
+            ++otherCount;
+        }
+    });
+    REQUIRE_EQ(result, spot_sbe::DispatchResult::Ok);
+    REQUIRE_EQ(priceFilterCount, 1);
+    REQUIRE_EQ(otherCount, 0);
+}
+
+TEST_CASE("dispatch: short buffer") {
+    auto storage = std::array<std::byte, 64>{};
+    auto buffer = std::span<std::byte>(storage);
+    auto const visitor = [](auto const&) {
+        FAIL("visitor must not be called");
+    };
+
+    REQUIRE_EQ(spot_sbe::dispatch(buffer.first(0), visitor), spot_sbe::DispatchResult::ShortBuffer);
+    REQUIRE_EQ(spot_sbe::dispatch(buffer.first(spot_sbe::MessageHeader::sbeEncodedLength() - 1), visitor),
+        spot_sbe::DispatchResult::ShortBuffer);
+
+    [[maybe_unused]] auto const encoded = spot_sbe::PriceFilter::wrapAndApplyHeader(buffer);
+    auto const messageLength = spot_sbe::MessageHeader::sbeEncodedLength() + spot_sbe::PriceFilter::sbeBlockLength();
+    REQUIRE_EQ(spot_sbe::dispatch(buffer.first(messageLength - 1), visitor), spot_sbe::DispatchResult::ShortBuffer);
+
+    // acting block length from header is used, not the one from schema
+    auto header = spot_sbe::MessageHeader{buffer.data()};
+    header.get<"blockLength">().value(spot_sbe::PriceFilter::sbeBlockLength() + 8);
+    REQUIRE_EQ(spot_sbe::dispatch(buffer.first(messageLength + 7), visitor), spot_sbe::DispatchResult::ShortBuffer);
+
+    std::size_t count = 0;
+    auto const result = spot_sbe::dispatch(buffer.first(messageLength + 8), [&](auto const& message) {
+        REQUIRE_EQ(message.actingBlockLength(), spot_sbe::PriceFilter::sbeBlockLength() + 8);
+        ++count;
+    });
+    REQUIRE_EQ(result, spot_sbe::DispatchResult::Ok);
+    REQUIRE_EQ(count, 1);
+}
+
+TEST_CASE("dispatch: schema id mismatch") {
+    auto storage = std::array<std::byte, 64>{};
+    auto buffer = std::span<std::byte>(storage);
+    auto const visitor = [](auto const&) {
+        FAIL("visitor must not be called");
+    };
+
+    [[maybe_unused]] auto const encoded = spot_sbe::PriceFilter::wrapAndApplyHeader(buffer);
+    auto header = spot_sbe::MessageHeader{buffer.data()};
+    header.get<"schemaId">().value(spot_sbe::PriceFilter::sbeSchemaId() + 1);
+    REQUIRE_EQ(spot_sbe::dispatch(buffer, visitor), spot_sbe::DispatchResult::SchemaIdMismatch);
+}
+
+TEST_CASE("dispatch: unsupported version") {
+    auto storage = std::array<std::byte, 64>{};
+    auto buffer = std::span<std::byte>(storage);
+    auto const visitor = [](auto const&) {
+        FAIL("visitor must not be called");
+    };
+
+    // message is introduced in version 1 of schema
+    [[maybe_unused]] auto const encoded = spot_sbe::WebSocketSessionSubscriptionsResponse::wrapAndApplyHeader(buffer);
+    REQUIRE_EQ(spot_sbe::dispatch(buffer, [](auto const&) {}), spot_sbe::DispatchResult::Ok);
+
+    auto header = spot_sbe::MessageHeader{buffer.data()};
+    header.get<"version">().value(0);
+    REQUIRE_EQ(spot_sbe::dispatch(buffer, visitor), spot_sbe::DispatchResult::UnsupportedVersion);
+}
+
+TEST_CASE("dispatch: unknown template id") {
+    auto storage = std::array<std::byte, 64>{};
+    auto buffer = std::span<std::byte>(storage);
+    auto const visitor = [](auto const&) {
+        FAIL("visitor must not be called");
+    };
+
+    [[maybe_unused]] auto const encoded = spot_sbe::PriceFilter::wrapAndApplyHeader(buffer);
+    auto header = spot_sbe::MessageHeader{buffer.data()};
+    header.get<"templateId">().value(12345);
+    REQUIRE_EQ(spot_sbe::dispatch(buffer, visitor), spot_sbe::DispatchResult::UnknownTemplateId);
+}
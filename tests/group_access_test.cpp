@@ -0,0 +1,149 @@
+// Copyright (c) Sergey Kovalevich <inndie@gmail.com>
+
+#include <algorithm>
+#include <array>
+#include <cstddef>
+#include <functional>
+#include <iterator>
+#include <span>
+
+#include <doctest/doctest.h>
+
+#include "schema.h"
+#include "fix_binary/schema.h"
+
+namespace {
+
+auto encodeDepth(std::span<std::byte> buffer) -> spot_sbe::DepthResponse {
+    auto message = spot_sbe::DepthResponse::wrapAndApplyHeader(buffer);
+    auto bids = message.get<"bids">();
+    bids.reset(5);
+    for (int i = 0; i < 5; ++i) {
+        bids.next();
+        bids.get<"price">().value(100 - i);
+        bids.get<"qty">().value(i);
+    }
+    auto asks = message.get<"asks">();
+    asks.reset(2);
+    for (int i = 0; i < 2; ++i) {
+        asks.next();
+        asks.get<"price">().value(200 + i);
+        asks.get<"qty">().value(i);
+    }
+    return message;
+}
+
+} // namespace
+
+static_assert(std::random_access_iterator<spot_sbe::DepthResponse::BidsGroup::Iterator>);
+
+TEST_CASE("group_access: random access") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeDepth(storage);
+
+    auto message = spot_sbe::DepthResponse(storage, encoded.offset());
+    auto bids = message.get<"bids">();
+    REQUIRE_EQ(bids.size(), 5);
+    REQUIRE_EQ(bids[3].get<"price">().value(), 97);
+    REQUIRE_EQ(bids[0].get<"qty">().value(), 0);
+
+    auto const it = std::ranges::lower_bound(bids, 98, std::greater{}, [](auto entry) {
+        return entry.template get<"price">().value();
+    });
+    REQUIRE_EQ(it - bids.begin(), 2);
+    REQUIRE_EQ(std::ranges::distance(bids), 5);
+}
+
+TEST_CASE("group_access: random access moves position past group") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeDepth(storage);
+
+    auto message = spot_sbe::DepthResponse(storage, encoded.offset());
+    auto bids = message.get<"bids">();
+    REQUIRE_EQ(bids[1].get<"price">().value(), 99);
+    REQUIRE_EQ(message.get<"asks">()[1].get<"price">().value(), 201);
+    REQUIRE_EQ(message.position(), encoded.position());
+
+    // sequential access to the same group isn't affected
+    bids.next();
+    REQUIRE_EQ(bids.get<"price">().value(), 100);
+    REQUIRE_EQ(message.position(), encoded.position());
+
+    auto iterated = spot_sbe::DepthResponse(storage, encoded.offset());
+    auto prices = 0;
+    for (auto entry : iterated.get<"bids">()) {
+        prices += entry.get<"price">().value();
+    }
+    REQUIRE_EQ(prices, 100 + 99 + 98 + 97 + 96);
+    REQUIRE_EQ(iterated.get<"asks">().size(), 2);
+
+#if defined(SBE_TEST_BOUNDS_CHECK_THROW)
+    REQUIRE_THROWS(bids[5]);
+#endif
+}
+
+TEST_CASE("group_access: skip") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeDepth(storage);
+
+    auto message = spot_sbe::DepthResponse(storage, encoded.offset());
+    message.get<"bids">().skip();
+    auto asks = message.get<"asks">();
+    REQUIRE_EQ(asks.size(), 2);
+    REQUIRE_EQ(asks[1].get<"price">().value(), 201);
+    asks.skip();
+    REQUIRE_EQ(message.position(), encoded.position());
+}
+
+TEST_CASE("group_access: scan") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeDepth(storage);
+
+    auto message = spot_sbe::DepthResponse(storage, encoded.offset());
+    REQUIRE(message.sbeScan());
+    REQUIRE_EQ(message.position(), encoded.position());
+
+    auto asks = message.get<"asks">();
+    REQUIRE(asks.hasNext());
+    asks.next();
+    REQUIRE_EQ(asks.get<"price">().value(), 200);
+
+    auto bids = message.get<"bids">();
+    bids.next();
+    bids.next();
+    REQUIRE_EQ(bids.get<"price">().value(), 99);
+    REQUIRE_EQ(message.get<"asks">()[1].get<"price">().value(), 201);
+
+    auto truncated = spot_sbe::DepthResponse(std::span(storage).first(encoded.position() - 1), encoded.offset());
+    REQUIRE_FALSE(truncated.sbeScan());
+}
+
+TEST_CASE("group_access: group added by later version than acting one") {
+    auto storage = std::array<std::byte, 256>{};
+    auto message = mktdata::MDIncrementalRefreshBook32::wrapAndApplyHeader(storage);
+    auto entries = message.get<"NoMDEntries">();
+    entries.reset(2);
+    entries.next().get<"SecurityID">().value(1);
+    entries.next().get<"SecurityID">().value(2);
+    auto const end = message.position();
+    auto const buffer = std::span(storage).first(end);
+    auto const blockLength = mktdata::MDIncrementalRefreshBook32::sbeBlockLength();
+
+    // NoOrderIDEntries (since version 7) is absent in message of version 6
+    auto decoded = mktdata::MDIncrementalRefreshBook32(buffer, message.offset(), blockLength, 6);
+    decoded.get<"NoMDEntries">().skip();
+    auto orders = decoded.get<"NoOrderIDEntries">();
+    REQUIRE_EQ(orders.size(), 0);
+    REQUIRE_FALSE(orders.hasNext());
+    orders.skip();
+    REQUIRE_EQ(decoded.position(), end);
+
+    auto scanned = mktdata::MDIncrementalRefreshBook32(buffer, message.offset(), blockLength, 6);
+    REQUIRE(scanned.sbeScan());
+    REQUIRE_EQ(scanned.position(), end);
+    REQUIRE_EQ(scanned.get<"NoOrderIDEntries">().size(), 0);
+    REQUIRE_EQ(scanned.get<"NoMDEntries">()[1].get<"SecurityID">().value(), 2);
+
+    auto latest = mktdata::MDIncrementalRefreshBook32(buffer, message.offset(), blockLength, 9);
+    REQUIRE_FALSE(latest.sbeScan());
+}
@@ -0,0 +1,33 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import importlib.util
+import pathlib
+import sys
+from typing import Any, Callable, Tuple
+
+import pytest
+
+from app.parser import Parser
+from app.generator import GeneratorBase
+from app.generation.python import Generator
+
+RESOURCES_DIR = pathlib.Path(__file__).parent.parent.parent.resolve() / 'resources'
+
+def load_codec(ir: dict, name: str, directory: str, record: str) -> Any:
+    ''' Generate python codec for schema definition and import it '''
+    Generator(f'{directory}/{name}', record=record).generate_from_definition(ir)
+    spec = importlib.util.spec_from_file_location(f'sbe_test_{len(sys.modules)}', f'{directory}/{name}/schema.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope='session')
+def make_codec(tmp_path_factory) -> Callable[..., Tuple[dict, Any]]:
+    ''' Return function generating python codec for schema (path or name of bundled one), it returns (IR, codec module) '''
+    def make(schema: str, record: str = 'dict') -> Tuple[dict, Any]:
+        path = schema if schema.endswith('.xml') else f'{RESOURCES_DIR}/{schema}.xml'
+        ir = GeneratorBase.make_schema_definition(Parser.from_file(path).get_schema())
+        return ir, load_codec(ir, pathlib.Path(path).stem, str(tmp_path_factory.mktemp('codec')), record)
+    return make
@@ -0,0 +1,43 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import pytest
+
+from app.synthetic import MessageSynthesizer
+
+@pytest.fixture(scope='module')
+def spot(make_codec):
+    return make_codec('spot_3_1')
+
+def find_message(ir: dict, name: str) -> dict:
+    return next(message for message in ir['messages'] if message['name'] == name)
+
+def test_decode_batch_of_evenly_spaced_messages(spot):
+    ir, codec = spot
+    message = find_message(ir, 'PriceFilter')
+    data = MessageSynthesizer(ir).make(message)
+    header_length = ir['header_type']['encoded_length']
+    batch = codec.PriceFilterMessage.decode_batch(data * 3, [ header_length + len(data) * index for index in range(3) ])
+    decoded = codec.Schema.decode(codec.CodecContext(data))
+    assert len(batch) == 3
+    assert batch['priceExponent'].tolist() == [ decoded['priceExponent'] ] * 3
+
+def test_decode_batch_of_gathered_messages(spot):
+    ir, codec = spot
+    message = find_message(ir, 'PriceFilter')
+    data = MessageSynthesizer(ir).make(message)
+    header_length = ir['header_type']['encoded_length']
+    # messages are separated by different gaps, so blocks are gathered into contiguous array
+    buffer = data + b'\x00' + data + b'\x00\x00\x00' + data
+    offsets = [ header_length, len(data) + 1 + header_length, 2 * len(data) + 4 + header_length ]
+    batch = codec.PriceFilterMessage.decode_batch(buffer, offsets)
+    assert len(batch) == 3
+    assert batch['priceExponent'].tolist() == [ codec.Schema.decode(codec.CodecContext(data))['priceExponent'] ] * 3
+
+@pytest.mark.parametrize('offsets', [ [], [ 8 ], [ 8, 16, 24 ], [ 8, 9, 30 ] ])
+def test_decode_batch_of_empty_blocks(spot, offsets):
+    ir, codec = spot
+    assert find_message(ir, 'PingResponse')['block_length'] == 0
+    batch = codec.PingResponseMessage.decode_batch(bytes(64), offsets)
+    assert batch.dtype.itemsize == 0
+    assert len(batch) == len(offsets)
@@ -0,0 +1,90 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import json
+import pathlib
+import shutil
+
+import pytest
+
+import app.cache
+from app.cache import SchemaCache
+from app.parser import Parser
+from app.generator import GeneratorBase
+
+from conftest import RESOURCES_DIR
+
+SCHEMA = '''<?xml version="1.0" encoding="UTF-8"?>
+<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" xmlns:xi="http://www.w3.org/2001/XInclude" package="cached" id="3" version="1">
+    <xi:include href="types.xml"/>
+    <sbe:message name="Order" id="1">
+        <field name="orderId" id="1" type="uint64"/>
+    </sbe:message>
+</sbe:messageSchema>
+'''
+
+TYPES = '''<?xml version="1.0" encoding="UTF-8"?>
+<types>
+    <composite name="messageHeader">
+        <type name="blockLength" primitiveType="uint16"/>
+        <type name="templateId" primitiveType="uint16"/>
+        <type name="schemaId" primitiveType="uint16"/>
+        <type name="version" primitiveType="uint16"/>
+    </composite>
+</types>
+'''
+
+@pytest.fixture
+def schema(tmp_path) -> pathlib.Path:
+    ''' Return path of schema including types from another file '''
+    (tmp_path / 'types.xml').write_text(TYPES)
+    path = tmp_path / 'schema.xml'
+    path.write_text(SCHEMA)
+    return path
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch) -> SchemaCache:
+    # version of the tool is computed once per process
+    monkeypatch.setattr(SchemaCache, 'VERSION', None)
+    return SchemaCache(str(tmp_path / 'cache'))
+
+def test_hit(cache, schema):
+    ir = GeneratorBase.make_schema_definition(Parser.from_file(str(schema)).get_schema())
+    assert cache.load(str(schema)) is None
+    cache.store(str(schema), ir)
+    assert cache.load(str(schema)) == json.loads(json.dumps(ir))
+    assert cache.load(str(schema), package='other') is None
+
+def test_hit_of_bundled_schema(cache, tmp_path):
+    path = shutil.copy(f'{RESOURCES_DIR}/FixBinary.xml', tmp_path)
+    ir = GeneratorBase.make_schema_definition(Parser.from_file(path).get_schema())
+    cache.store(path, ir)
+    assert cache.load(path) == json.loads(json.dumps(ir))
+
+def test_miss_after_schema_edit(cache, schema):
+    cache.store(str(schema), { 'name': 'cached' })
+    schema.write_text(SCHEMA.replace('orderId', 'orderNo'))
+    assert cache.load(str(schema)) is None
+
+def test_miss_after_include_edit(cache, schema):
+    cache.store(str(schema), { 'name': 'cached' })
+    assert cache.load(str(schema)) == { 'name': 'cached' }
+    (schema.parent / 'types.xml').write_text(TYPES.replace('uint16', 'uint32', 1))
+    assert cache.load(str(schema)) is None
+
+def test_miss_after_tool_source_edit(cache, schema, tmp_path, monkeypatch):
+    # sources of the tool are read relative to app/cache.py, use their copy
+    sources = tmp_path / 'app'
+    sources.mkdir()
+    for source in app.cache.SOURCE_FILES:
+        shutil.copy(pathlib.Path(app.cache.__file__).parent / source, sources)
+    monkeypatch.setattr(app.cache, '__file__', str(sources / 'cache.py'))
+
+    cache.store(str(schema), { 'name': 'cached' })
+    SchemaCache.VERSION = None
+    assert cache.load(str(schema)) == { 'name': 'cached' }
+
+    with open(sources / 'parser.py', mode='a') as f:
+        f.write('\n# changed\n')
+    SchemaCache.VERSION = None
+    assert cache.load(str(schema)) is None
@@ -0,0 +1,55 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import pytest
+
+from app.synthetic import MessageSynthesizer
+
+SCHEMAS = [ 'spot_3_1', 'b3-market-data-messages-1.3.1', 'FixBinary' ]
+
+@pytest.fixture(scope='module', params=SCHEMAS)
+def values(request, make_codec):
+    ''' Return codec and (template id, decoded value) of every message of schema, groups and var data are not empty '''
+    ir, codec = make_codec(request.param)
+    synthesizer = MessageSynthesizer(ir, group_count=3, data_length=5)
+    values = []
+    for message in ir['messages']:
+        data = synthesizer.make(message)
+        values.append((message['id'], codec.Schema.decode(codec.CodecContext(data))))
+    return codec, values
+
+def encode(codec, value, template_id: int) -> bytes:
+    ''' Encode message into buffer larger than needed and return encoded part '''
+    buffer = bytearray(1 << 16)
+    ctx = codec.CodecContext(buffer)
+    codec.Schema.encode(ctx, value, template_id=template_id)
+    return bytes(buffer[:ctx.offset])
+
+def test_compute_size(values):
+    codec, values = values
+    for template_id, value in values:
+        size = codec.Schema.compute_size(value, template_id=template_id)
+        assert size == len(encode(codec, value, template_id))
+        cls = codec.Schema.getCodecCls(template_id)
+        assert cls.compute_size(value) == size - codec.MessageHeader.ENCODED_LENGTH
+
+def test_encoder_output_matches_schema_encode(values):
+    codec, values = values
+    # small pool and buffers, so buffers holding bytes of other (larger) messages are reused
+    encoder = codec.Encoder(buffer_size=16, pool_size=2)
+    for _ in range(2):
+        for template_id, value in reversed(values):
+            view = encoder.encode(value, template_id=template_id)
+            assert bytes(view) == encode(codec, value, template_id)
+            encoder.release(view)
+
+def test_encoder_pool_reuses_buffers(values):
+    codec, values = values
+    template_id, value = values[0]
+    encoder = codec.Encoder()
+    view = encoder.encode(value, template_id=template_id)
+    buffer = view.obj
+    encoder.release(view)
+    view = encoder.encode(value, cls=codec.Schema.getCodecCls(template_id))
+    assert view.obj is buffer
+    assert bytes(view) == encode(codec, value, template_id)
@@ -0,0 +1,86 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import builtins
+import os
+
+import pytest
+
+from app.synthetic import MessageSynthesizer
+
+MESSAGE_NAMES = [ 'PriceFilter', 'Ticker24hFullResponse', 'PingResponse', 'NewOrderFullResponse' ]
+
+@pytest.fixture(scope='module')
+def spot(make_codec):
+    ir, codec = make_codec('spot_3_1')
+    synthesizer = MessageSynthesizer(ir, group_count=3, data_length=5)
+    messages = [ (message['id'], synthesizer.make(message)) for message in ir['messages'] if message['name'] in MESSAGE_NAMES ]
+    return codec, messages * 3
+
+@pytest.fixture
+def capture(spot, tmp_path):
+    ''' Return path of file of synthesized messages '''
+    path = tmp_path / 'messages.bin'
+    path.write_bytes(b''.join(data for _, data in spot[1]))
+    return str(path)
+
+def decode(codec, data: bytes):
+    return codec.Schema.decode(codec.CodecContext(data))
+
+def test_read(spot, capture):
+    codec, messages = spot
+    with codec.SbeFileReader(capture) as reader:
+        assert len(reader) == len(messages)
+        assert list(reader) == [ decode(codec, data) for _, data in messages ]
+        assert reader[-1] == decode(codec, messages[-1][1])
+        assert [ reader.template_id(i) for i in range(len(reader)) ] == [ template_id for template_id, _ in messages ]
+        assert reader.offset(1) == len(messages[0][1])
+
+def test_filter_slice_view(spot, capture):
+    codec, messages = spot
+    template_id = messages[1][0]
+    expected = [ decode(codec, data) for value, data in messages if value == template_id ]
+    with codec.SbeFileReader(capture) as reader:
+        selected = reader.filter(template_id)
+        assert list(selected) == expected
+        assert list(reader.filter([ template_id, messages[2][0] ])) == [ decode(codec, data) for value, data in messages if value in (template_id, messages[2][0]) ]
+        assert list(selected[1:]) == expected[1:]
+        assert len(reader[2:5]) == 3
+        assert reader[2:5][0] == decode(codec, messages[2][1])
+
+        assert reader.view(1).encoded_length() == len(messages[1][1]) - codec.MessageHeader.ENCODED_LENGTH
+
+def test_persist_index(spot, capture, monkeypatch):
+    codec, messages = spot
+    with codec.SbeFileReader(capture, persist_index=True) as reader:
+        offsets = [ reader.offset(i) for i in range(len(reader)) ]
+    assert os.path.isfile(capture + codec.SbeFileReader.INDEX_SUFFIX)
+
+    # index is loaded instead of walking the file
+    with monkeypatch.context() as patch:
+        patch.setattr(codec.SbeFileReader, '_build_index', lambda self: pytest.fail('index is rebuilt'))
+        with codec.SbeFileReader(capture, persist_index=True) as reader:
+            assert [ reader.offset(i) for i in range(len(reader)) ] == offsets
+            assert list(reader) == [ decode(codec, data) for _, data in messages ]
+
+    # index of modified file is stale
+    with open(capture, mode='ab') as f:
+        f.write(messages[0][1])
+    with codec.SbeFileReader(capture, persist_index=True) as reader:
+        assert len(reader) == len(messages) + 1
+
+@pytest.mark.parametrize('truncate', [ 1, 5 ])
+def test_truncated_file(spot, capture, truncate, monkeypatch):
+    codec, _ = spot
+    with open(capture, mode='r+b') as f:
+        f.truncate(os.path.getsize(capture) - truncate)
+
+    files = []
+    def recording_open(*args, **kwargs):
+        files.append(builtins.open(*args, **kwargs))
+        return files[-1]
+    monkeypatch.setattr(codec, 'open', recording_open, raising=False)
+
+    with pytest.raises(Exception, match='incomplete message'):
+        codec.SbeFileReader(capture)
+    assert len(files) == 1 and files[0].closed
@@ -0,0 +1,46 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import importlib
+import os
+
+import pytest
+
+from app.parser import Parser
+from app.generator import GeneratorBase
+
+from conftest import RESOURCES_DIR
+
+def generate(generator: str, schema: str, path: str, **options) -> None:
+    ''' Generate codec of bundled schema by generator into path '''
+    ir = GeneratorBase.make_schema_definition(Parser.from_file(f'{RESOURCES_DIR}/{schema}.xml').get_schema())
+    importlib.import_module(f'app.generation.{generator}').Generator(str(path), **options).generate_from_definition(ir)
+
+@pytest.mark.parametrize('generator', [ 'cpp', 'cpp-min', 'python' ])
+def test_foreign_files_survive_generation(tmp_path, generator):
+    (tmp_path / 'handwritten.h').write_text('// not generated\n')
+    (tmp_path / 'handwritten.py').write_text('# not generated\n')
+    generate(generator, 'FixBinary', tmp_path)
+    generate(generator, 'spot_3_1', tmp_path)
+    assert (tmp_path / 'handwritten.h').read_text() == '// not generated\n'
+    assert (tmp_path / 'handwritten.py').read_text() == '# not generated\n'
+
+def test_stale_documents_are_removed(tmp_path):
+    generate('cpp', 'FixBinary', tmp_path)
+    assert (tmp_path / 'MDIncrementalRefreshBook32.h').is_file()
+    generate('cpp', 'spot_3_1', tmp_path)
+    assert not (tmp_path / 'MDIncrementalRefreshBook32.h').exists()
+    assert (tmp_path / 'PriceFilter.h').is_file()
+
+def test_generators_share_output_directory(tmp_path):
+    generate('cpp', 'FixBinary', tmp_path)
+    generate('python', 'FixBinary', tmp_path)
+    assert sorted(path.name for path in tmp_path.glob('.sbe-code-gen.*.json')) == [ '.sbe-code-gen.cpp.json', '.sbe-code-gen.python.json' ]
+
+    # every generator removes only its own stale documents
+    generate('cpp', 'spot_3_1', tmp_path)
+    assert (tmp_path / 'schema.py').is_file()
+    assert not (tmp_path / 'MDIncrementalRefreshBook32.h').exists()
+    generate('python', 'spot_3_1', tmp_path)
+    assert (tmp_path / 'PriceFilter.h').is_file()
+    assert (tmp_path / 'schema.py').is_file()
@@ -0,0 +1,41 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from conftest import RESOURCES_DIR
+
+ROOT_DIR = RESOURCES_DIR.parent
+
+def run(*args: str) -> None:
+    ''' Run the tool as command line does '''
+    subprocess.run([ sys.executable, '-m', 'app', *args ], cwd=ROOT_DIR, check=True, stdout=subprocess.DEVNULL)
+
+def read_tree(path: pathlib.Path) -> dict:
+    ''' Return content of every file in directory by its relative path '''
+    return { str(file.relative_to(path)): file.read_bytes() for file in sorted(path.rglob('*')) if file.is_file() }
+
+@pytest.mark.parametrize('schema', [ 'FixBinary', 'spot_3_1' ])
+def test_jobs_output_is_identical(tmp_path, schema):
+    for jobs in (1, 4):
+        run(f'--schema={RESOURCES_DIR}/{schema}.xml', f'--destination={tmp_path}/jobs-{jobs}', '--generator=cpp', f'--jobs={jobs}')
+    expected = read_tree(tmp_path / 'jobs-1')
+    assert len(expected) > 1
+    assert read_tree(tmp_path / 'jobs-4') == expected
+
+@pytest.mark.parametrize('generator', [ 'cpp', 'cpp-min', 'python' ])
+def test_cache_output_is_identical(tmp_path, generator):
+    schema = f'--schema={RESOURCES_DIR}/FixBinary.xml'
+    run(schema, f'--destination={tmp_path}/uncached', f'--generator={generator}')
+    run(schema, f'--destination={tmp_path}/cold', f'--generator={generator}', f'--cache-dir={tmp_path}/cache')
+    assert list((tmp_path / 'cache').glob('*.json'))
+    assert list((tmp_path / 'cache' / 'templates').iterdir())
+    run(schema, f'--destination={tmp_path}/warm', f'--generator={generator}', f'--cache-dir={tmp_path}/cache')
+
+    expected = read_tree(tmp_path / 'uncached')
+    assert read_tree(tmp_path / 'cold') == expected
+    assert read_tree(tmp_path / 'warm') == expected
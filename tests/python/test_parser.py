@@ -0,0 +1,34 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import sys
+from typing import Any, Callable
+
+from app.parser import Parser
+from app.synthetic import SchemaOptions, SchemaSynthesizer
+
+def count_calls(fn: Callable[[], Any]) -> int:
+    ''' Return number of python and builtin function calls made by fn() (unlike wall time it doesn't vary between runs) '''
+    count = 0
+    def profile(frame, event, arg) -> None:
+        nonlocal count
+        if event in ('call', 'c_call'):
+            count += 1
+    sys.setprofile(profile)
+    try:
+        fn()
+    finally:
+        sys.setprofile(None)
+    return count
+
+def test_get_schema_scales_linearly(tmp_path):
+    # number of types grows together with number of messages, so every type lookup is done against a
+    # growing set of types (quadratic with lookup by scanning <types>: 9x calls for 4x schema)
+    sizes = [ 100, 200, 400 ]
+    calls = []
+    for size in sizes:
+        path = f'{tmp_path}/{size}/schema.xml'
+        SchemaSynthesizer(SchemaOptions(messages=size, fields=10, enums=size, composites=size // 2, sets=size // 4)).write(path)
+        calls.append(count_calls(Parser.from_file(path).get_schema))
+    for (size, count), (next_size, next_count) in zip(zip(sizes, calls), zip(sizes[1:], calls[1:])):
+        assert next_count / count < 1.2 * next_size / size, f'get_schema calls grow faster than schema: {calls}'
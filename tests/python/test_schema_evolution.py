@@ -0,0 +1,129 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import pytest
+
+RECORDS = [ 'dict', 'tuple', 'namedtuple', 'slots' ]
+
+def make_schema(version: int) -> str:
+    ''' Return schema of given version, version 2 appends fields to message block and to group entry block '''
+    since_version_2 = version >= 2
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="versioned" id="7" version="{version}" byteOrder="littleEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <composite name="groupSizeEncoding">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="numInGroup" primitiveType="uint16"/>
+        </composite>
+        <composite name="varStringEncoding">
+            <type name="length" primitiveType="uint16"/>
+            <type name="varData" primitiveType="uint8" length="0" characterEncoding="UTF-8"/>
+        </composite>
+    </types>
+    <sbe:message name="Order" id="1">
+        <field name="orderId" id="1" type="uint64"/>
+        <field name="price" id="2" type="int64"/>
+        {'<field name="quantity" id="3" type="int32" sinceVersion="2"/>' if since_version_2 else ''}
+        <group name="fills" id="10" dimensionType="groupSizeEncoding">
+            <field name="fillQty" id="11" type="uint32"/>
+            {'<field name="fee" id="12" type="int32" sinceVersion="2"/>' if since_version_2 else ''}
+        </group>
+        <data name="note" id="20" type="varStringEncoding"/>
+    </sbe:message>
+</sbe:messageSchema>
+'''
+
+@pytest.fixture(scope='module')
+def codecs(make_codec, tmp_path_factory):
+    ''' Return codec by (schema version, record type) '''
+    directory = tmp_path_factory.mktemp('schema')
+    codecs = {}
+    for version in (1, 2):
+        path = f'{directory}/versioned_v{version}.xml'
+        with open(path, mode='w', encoding='utf8') as f:
+            f.write(make_schema(version))
+        for record in RECORDS:
+            codecs[(version, record)] = make_codec(path, record)[1]
+    return codecs
+
+def make_record(cls, record: str, **values):
+    if record == 'dict':
+        return values
+    if record == 'tuple':
+        return tuple(values.values())
+    return cls.RECORD(**values)
+
+def as_dict(value, record: str, names: list) -> dict:
+    if record == 'dict':
+        return value
+    if record == 'tuple':
+        return dict(zip(names, value))
+    return { name: getattr(value, name) for name in names }
+
+def encode_order(codec, record: str, version: int) -> bytes:
+    fills = [ (3, -1), (4, 2) ]
+    if version >= 2:
+        entries = [ make_record(codec.OrderMessage.Fills, record, fillQty=quantity, fee=fee) for quantity, fee in fills ]
+        value = make_record(codec.OrderMessage, record, orderId=1, price=-5, quantity=7, fills=entries, note='hi')
+    else:
+        entries = [ make_record(codec.OrderMessage.Fills, record, fillQty=quantity) for quantity, _ in fills ]
+        value = make_record(codec.OrderMessage, record, orderId=1, price=-5, fills=entries, note='hi')
+    buffer = bytearray(codec.Schema.compute_size(value, cls=codec.OrderMessage))
+    codec.Schema.encode(codec.CodecContext(buffer), value, cls=codec.OrderMessage)
+    return bytes(buffer)
+
+def decode_order(codec, record: str, data: bytes, names: list, entry_names: list) -> dict:
+    ctx = codec.CodecContext(data)
+    value = as_dict(codec.Schema.decode(ctx), record, names)
+    assert ctx.offset == len(data)
+    value['fills'] = [ as_dict(entry, record, entry_names) for entry in value['fills'] ]
+    return value
+
+@pytest.mark.parametrize('record', RECORDS)
+def test_older_codec_decodes_newer_message(codecs, record):
+    data = encode_order(codecs[(2, record)], record, 2)
+    codec = codecs[(1, record)]
+
+    value = decode_order(codec, record, data, [ 'orderId', 'price', 'fills', 'note' ], [ 'fillQty' ])
+    assert value == { 'orderId': 1, 'price': -5, 'fills': [ { 'fillQty': 3 }, { 'fillQty': 4 } ], 'note': 'hi' }
+
+    # longer blocks are skipped by acting block length, so messages following each other are decoded too
+    assert len(list(codec.Schema.iter_decode([ data * 2 ]))) == 2
+
+    view = codec.Schema.view(codec.CodecContext(data))
+    assert (view.orderId, view.price, view.note) == (1, -5, 'hi')
+    assert [ entry.fillQty for entry in view.fills ] == [ 3, 4 ]
+    assert view.encoded_length() == len(data) - codec.MessageHeader.ENCODED_LENGTH
+
+@pytest.mark.parametrize('record', RECORDS)
+def test_newer_codec_decodes_older_message(codecs, record):
+    data = encode_order(codecs[(1, record)], record, 1)
+    codec = codecs[(2, record)]
+
+    value = decode_order(codec, record, data, [ 'orderId', 'price', 'quantity', 'fills', 'note' ], [ 'fillQty', 'fee' ])
+    assert value == {
+        'orderId': 1,
+        'price': -5,
+        'quantity': None,
+        'fills': [ { 'fillQty': 3, 'fee': None }, { 'fillQty': 4, 'fee': None } ],
+        'note': 'hi'
+    }
+
+    view = codec.Schema.view(codec.CodecContext(data))
+    assert (view.orderId, view.price, view.quantity, view.note) == (1, -5, None, 'hi')
+    assert [ (entry.fillQty, entry.fee) for entry in view.fills ] == [ (3, None), (4, None) ]
+    assert view.encoded_length() == len(data) - codec.MessageHeader.ENCODED_LENGTH
+
+@pytest.mark.parametrize('record', RECORDS)
+def test_same_version_roundtrip(codecs, record):
+    codec = codecs[(2, record)]
+    data = encode_order(codec, record, 2)
+    value = decode_order(codec, record, data, [ 'orderId', 'price', 'quantity', 'fills', 'note' ], [ 'fillQty', 'fee' ])
+    assert value['quantity'] == 7
+    assert [ entry['fee'] for entry in value['fills'] ] == [ -1, 2 ]
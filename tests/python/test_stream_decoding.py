@@ -0,0 +1,107 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import asyncio
+import io
+
+import pytest
+
+from app.synthetic import MessageSynthesizer
+
+MESSAGE_NAMES = [ 'PriceFilter', 'Ticker24hFullResponse', 'ExchangeInfoResponse', 'PingResponse', 'NewOrderFullResponse' ]
+
+@pytest.fixture(scope='module')
+def spot(make_codec):
+    ir, codec = make_codec('spot_3_1')
+    synthesizer = MessageSynthesizer(ir, group_count=3, data_length=5)
+    messages = [ synthesizer.make(message) for message in ir['messages'] if message['name'] in MESSAGE_NAMES ]
+    return codec, messages
+
+def decode_all(codec, data: bytes) -> list:
+    ctx = codec.CodecContext(data)
+    values = []
+    while ctx.offset < len(data):
+        values.append(codec.Schema.decode(ctx))
+    return values
+
+@pytest.mark.parametrize('chunk_size', [ 1, 2, 3, 7, 64, 1 << 20 ])
+def test_iter_decode_chunks(spot, chunk_size):
+    codec, messages = spot
+    stream = b''.join(messages)
+    chunks = [ stream[offset:offset + chunk_size] for offset in range(0, len(stream), chunk_size) ]
+    assert list(codec.Schema.iter_decode(chunks)) == decode_all(codec, stream)
+
+def test_iter_decode_file(spot):
+    codec, messages = spot
+    stream = b''.join(messages)
+    assert list(codec.Schema.iter_decode(io.BytesIO(stream), chunk_size=5)) == decode_all(codec, stream)
+
+def test_iter_decode_walks_complete_messages_once(spot, monkeypatch):
+    codec, messages = spot
+    # message_end (a second walk over message) is needed only to tell incomplete message from broken one
+    monkeypatch.setattr(codec.Schema, 'message_end', staticmethod(lambda *args: pytest.fail('message walked twice')))
+    assert len(list(codec.Schema.iter_decode(messages))) == len(messages)
+
+def test_iter_decode_incomplete_tail(spot):
+    codec, messages = spot
+    stream = b''.join(messages)
+    with pytest.raises(Exception, match='incomplete message'):
+        list(codec.Schema.iter_decode([ stream[:-1] ]))
+
+async def serve_and_read(stream: bytes, write_size: int, read) -> list:
+    ''' Serve stream by writes of write_size bytes from local server and return read(reader) result '''
+    async def handle(reader, writer):
+        for offset in range(0, len(stream), write_size):
+            writer.write(stream[offset:offset + write_size])
+            await writer.drain()
+            # let client receive every write separately
+            await asyncio.sleep(0)
+        writer.close()
+        await writer.wait_closed()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        try:
+            return await read(reader)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+@pytest.mark.parametrize('write_size,chunk_size', [ (1, 16), (3, 16), (5, 1024), (1 << 16, 32) ])
+def test_aread_decode(spot, write_size, chunk_size):
+    codec, messages = spot
+    stream = b''.join(messages) * 3
+
+    async def read(reader):
+        return [ value async for value in codec.Schema.aread(reader, chunk_size=chunk_size) ]
+
+    assert asyncio.run(serve_and_read(stream, write_size, read)) == decode_all(codec, stream)
+
+@pytest.mark.parametrize('write_size,chunk_size', [ (1, 16), (7, 16), (1 << 16, 32) ])
+def test_aread_view(spot, write_size, chunk_size):
+    codec, messages = spot
+    stream = b''.join(messages) * 3
+    expected = []
+    for message, value in zip(messages * 3, decode_all(codec, stream)):
+        header = codec.MessageHeader.unpack(codec.CodecContext(message))
+        expected.append((header['templateId'], len(message) - codec.MessageHeader.ENCODED_LENGTH, value.get('priceExponent')))
+
+    async def read(reader):
+        values = []
+        async for view in codec.Schema.aread(reader, view=True, chunk_size=chunk_size):
+            # view refers to the reused receive buffer (message is not copied), so it is used before the next one
+            assert isinstance(view._buffer.obj, bytearray)
+            values.append((view.TEMPLATE_ID, view.encoded_length(), getattr(view, 'priceExponent', None)))
+        return values
+
+    assert asyncio.run(serve_and_read(stream, write_size, read)) == expected
+
+def test_aread_incomplete_tail(spot):
+    codec, messages = spot
+
+    async def read(reader):
+        return [ value async for value in codec.Schema.aread(reader) ]
+
+    with pytest.raises(Exception, match='incomplete message'):
+        asyncio.run(serve_and_read(b''.join(messages)[:-1], 7, read))
@@ -0,0 +1,70 @@
+# Copyright (C) 2024 Sergey Kovalevich <inndie@gmail.com>
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+import struct
+
+import pytest
+
+SCHEMA = '''<?xml version="1.0" encoding="UTF-8"?>
+<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="vardata" id="9" version="1" byteOrder="bigEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <composite name="varStringEncoding">
+            <type name="length" primitiveType="uint16"/>
+            <type name="varData" primitiveType="uint8" length="0" characterEncoding="UTF-8"/>
+        </composite>
+        <composite name="varDataEncoding">
+            <type name="length" primitiveType="uint16"/>
+            <type name="varData" primitiveType="uint8" length="0"/>
+        </composite>
+    </types>
+    <sbe:message name="Series" id="1">
+        <field name="seriesId" id="1" type="uint32"/>
+        <data name="name" id="2" type="varStringEncoding"/>
+        <data name="points" id="3" type="varDataEncoding"/>
+    </sbe:message>
+</sbe:messageSchema>
+'''
+
+@pytest.fixture(scope='module')
+def codec(make_codec, tmp_path_factory):
+    path = f'{tmp_path_factory.mktemp("schema")}/vardata.xml'
+    with open(path, mode='w', encoding='utf8') as f:
+        f.write(SCHEMA)
+    return make_codec(path)[1]
+
+def encode(codec, value) -> bytes:
+    buffer = bytearray(codec.Schema.compute_size(value, cls=codec.SeriesMessage))
+    codec.Schema.encode(codec.CodecContext(buffer), value, cls=codec.SeriesMessage)
+    return bytes(buffer)
+
+def test_roundtrip(codec):
+    data = encode(codec, { 'seriesId': 3, 'name': 'ab', 'points': [ 1, 2, 255 ] })
+
+    # length is encoded with byte order of schema
+    assert data.endswith(struct.pack('>H2sH3B', 2, b'ab', 3, 1, 2, 255))
+
+    ctx = codec.CodecContext(data)
+    assert codec.Schema.decode(ctx) == { 'seriesId': 3, 'name': 'ab', 'points': [ 1, 2, 255 ] }
+    assert ctx.offset == len(data)
+
+    view = codec.Schema.view(codec.CodecContext(data))
+    assert (view.name, bytes(view.points)) == ('ab', b'\x01\x02\xff')
+    assert view.encoded_length() == len(data) - codec.MessageHeader.ENCODED_LENGTH
+
+# value of data must not be silently cut by the end of buffer
+@pytest.mark.parametrize('truncate', [ 1, 2, 4, 5 ])
+def test_truncated_buffer(codec, truncate):
+    data = encode(codec, { 'seriesId': 3, 'name': 'ab', 'points': [ 1, 2 ] })[:-truncate]
+
+    with pytest.raises(struct.error):
+        codec.Schema.decode(codec.CodecContext(data))
+    with pytest.raises(struct.error):
+        view = codec.Schema.view(codec.CodecContext(data))
+        view.name
+        view.points
@@ -0,0 +1,171 @@
+// Copyright (c) Sergey Kovalevich <inndie@gmail.com>
+
+// Runs against codecs generated with each bounds check policy, validation doesn't depend on it.
+// SBE_TEST_BOUNDS_CHECK_THROW is defined for the codec generated with throw policy
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <span>
+
+#include <doctest/doctest.h>
+
+#include "schema.h"
+#include "fix_binary/schema.h"
+
+namespace {
+
+constexpr std::size_t kHeaderLength = spot_sbe::MessageHeader::sbeEncodedLength();
+constexpr std::size_t kDimensionLength = 4;
+
+// WebSocketResponse: block, 2 entries of rateLimits group, id and result data
+auto encodeResponse(std::span<std::byte> buffer) -> spot_sbe::WebSocketResponse {
+    auto message = spot_sbe::WebSocketResponse::wrapAndApplyHeader(buffer);
+    message.get<"status">().value(200);
+    auto rateLimits = message.get<"rateLimits">();
+    rateLimits.reset(2);
+    for (int i = 0; i < 2; ++i) {
+        rateLimits.next();
+        rateLimits.get<"intervalNum">().value(i + 1);
+        rateLimits.get<"rateLimit">().value(100);
+    }
+    message.get<"id">().value("abc");
+    auto const result = std::array<std::uint8_t, 4>{1, 2, 3, 4};
+    message.get<"result">().value(result);
+    return message;
+}
+
+constexpr auto groupOffset() noexcept -> std::size_t {
+    return kHeaderLength + spot_sbe::WebSocketResponse::sbeBlockLength();
+}
+
+constexpr auto groupEntriesOffset() noexcept -> std::size_t {
+    return groupOffset() + kDimensionLength;
+}
+
+constexpr auto dataOffset() noexcept -> std::size_t {
+    return groupEntriesOffset() + 2 * spot_sbe::WebSocketResponse::RateLimitsGroup::sbeBlockLength();
+}
+
+// MDIncrementalRefreshBook32 encoded with version 6: NoOrderIDEntries group (since version 7) is absent
+auto encodeBookVersion6(std::span<std::byte> buffer) -> std::size_t {
+    auto message = mktdata::MDIncrementalRefreshBook32::wrapAndApplyHeader(buffer);
+    auto entries = message.get<"NoMDEntries">();
+    entries.reset(2);
+    for (int i = 0; i < 2; ++i) {
+        entries.next();
+        entries.get<"SecurityID">().value(i + 1);
+    }
+    mktdata::MessageHeader{buffer.data()}.get<"version">().value(6);
+    return message.position();
+}
+
+} // namespace
+
+TEST_CASE("validate: complete message") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeResponse(storage);
+    auto const buffer = std::span<std::byte>(storage).first(encoded.position());
+
+    REQUIRE(spot_sbe::validate(buffer));
+    REQUIRE(spot_sbe::WebSocketResponse::sbeValidate(buffer, kHeaderLength));
+    REQUIRE(spot_sbe::validate(std::span<std::byte>(storage)));
+}
+
+TEST_CASE("validate: truncated header") {
+    auto storage = std::array<std::byte, 256>{};
+    [[maybe_unused]] auto const encoded = encodeResponse(storage);
+    auto const buffer = std::span<std::byte>(storage);
+
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(0)));
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(kHeaderLength - 1)));
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(groupOffset() - 1)));
+}
+
+TEST_CASE("validate: truncated group") {
+    auto storage = std::array<std::byte, 256>{};
+    [[maybe_unused]] auto const encoded = encodeResponse(storage);
+    auto const buffer = std::span<std::byte>(storage);
+
+    // dimension
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(groupOffset())));
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(groupEntriesOffset() - 1)));
+    // entries
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(groupEntriesOffset())));
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(dataOffset() - 1)));
+}
+
+TEST_CASE("validate: truncated data") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeResponse(storage);
+    auto const buffer = std::span<std::byte>(storage);
+
+    // length of id
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(dataOffset())));
+    // value of id
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(dataOffset() + 1 + 2)));
+    // value of result
+    REQUIRE_FALSE(spot_sbe::validate(buffer.first(encoded.position() - 1)));
+}
+
+TEST_CASE("validate: block length shorter than schema") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeResponse(storage);
+    auto const buffer = std::span<std::byte>(storage).first(encoded.position());
+
+    auto const blockLength = spot_sbe::WebSocketResponse::sbeBlockLength();
+    auto const version = spot_sbe::WebSocketResponse::sbeVersion();
+    REQUIRE_FALSE(spot_sbe::WebSocketResponse::sbeValidate(buffer, kHeaderLength, blockLength - 1, version));
+
+    auto header = spot_sbe::MessageHeader{buffer.data()};
+    header.get<"blockLength">().value(blockLength - 1);
+    REQUIRE_FALSE(spot_sbe::validate(buffer));
+    header.get<"blockLength">().value(blockLength);
+    REQUIRE(spot_sbe::validate(buffer));
+
+    // block length of group entry
+    auto dimension = spot_sbe::GroupSize16Encoding{buffer.data() + groupOffset()};
+    auto const entryLength = dimension.get<"blockLength">().value();
+    dimension.get<"blockLength">().value(entryLength - 1);
+    REQUIRE_FALSE(spot_sbe::validate(buffer));
+}
+
+TEST_CASE("validate: group added by later version than acting one") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const buffer = std::span<std::byte>(storage).first(encodeBookVersion6(storage));
+    auto const headerLength = mktdata::MessageHeader::sbeEncodedLength();
+    auto const blockLength = mktdata::MDIncrementalRefreshBook32::sbeBlockLength();
+
+    REQUIRE(mktdata::validate(buffer));
+    REQUIRE(mktdata::MDIncrementalRefreshBook32::sbeValidate(buffer, headerLength, blockLength, 6));
+    REQUIRE_FALSE(mktdata::MDIncrementalRefreshBook32::sbeValidate(buffer, headerLength, blockLength, 7));
+    REQUIRE_FALSE(mktdata::validate(buffer.first(buffer.size() - 1)));
+
+    mktdata::MessageHeader{buffer.data()}.get<"version">().value(mktdata::MDIncrementalRefreshBook32::sbeVersion());
+    REQUIRE_FALSE(mktdata::validate(buffer));
+}
+
+#if defined(SBE_TEST_BOUNDS_CHECK_THROW)
+
+TEST_CASE("validate: access to truncated message throws") {
+    auto storage = std::array<std::byte, 256>{};
+    auto const encoded = encodeResponse(storage);
+    auto const buffer = std::span<std::byte>(storage);
+
+    REQUIRE_THROWS(spot_sbe::WebSocketResponse(buffer.first(groupOffset() - 1), kHeaderLength));
+
+    auto truncatedDimension = spot_sbe::WebSocketResponse(buffer.first(groupEntriesOffset() - 1), kHeaderLength);
+    REQUIRE_THROWS(truncatedDimension.get<"rateLimits">());
+
+    auto truncatedEntries = spot_sbe::WebSocketResponse(buffer.first(dataOffset() - 1), kHeaderLength);
+    auto rateLimits = truncatedEntries.get<"rateLimits">();
+    rateLimits.next();
+    REQUIRE_THROWS(rateLimits.next());
+
+    auto truncatedData = spot_sbe::WebSocketResponse(buffer.first(encoded.position() - 1), kHeaderLength);
+    truncatedData.get<"rateLimits">().skip();
+    REQUIRE_EQ(truncatedData.get<"id">().value(), "abc");
+    REQUIRE_THROWS(truncatedData.get<"result">().value());
+}
+
+#endif